@@ -5,5 +5,7 @@ from .project_api import project_bp
 from .index_api import index_bp
 from .task_api import task_bp
 from .key_api import key_bp
+from .job_api import job_bp
+from .search_api import search_bp
 
-__all__ = ["project_bp", "index_bp", "task_bp", "key_bp"]
+__all__ = ["project_bp", "index_bp", "task_bp", "key_bp", "job_bp", "search_bp"]
@@ -1,13 +1,25 @@
 """
 Index API endpoints
 """
+import csv
+import io
 import json
+import logging
+import time
 import requests as http_requests
-from flask import Blueprint, request, jsonify
-from backend.services import ProjectService
+from flask import Blueprint, Response, request, jsonify
+from backend.services import (
+    ProjectService, IngestionEngine, IngestionError, IngestionBacklogError, job_service, search_cache,
+    task_watcher
+)
+from backend.services.ingestion_service import import_file, import_url
+from backend.utils.config import config
+from backend.utils.document_stream import chain_first, iter_gzip
+from backend.utils.query_log import query_log
 
 index_bp = Blueprint("indexes", __name__, url_prefix="/api/projects/<int:project_id>/indexes")
 project_service = ProjectService()
+logger = logging.getLogger(__name__)
 
 
 def get_meilisearch_service(project_id):
@@ -15,6 +27,28 @@ def get_meilisearch_service(project_id):
     return project_service.get_meilisearch_client(project_id)
 
 
+@index_bp.after_request
+def track_write_tasks(response):
+    """Invalidate cached searches of an index written through this blueprint"""
+    if not search_cache.enabled or request.method not in ("POST", "PUT", "PATCH", "DELETE"):
+        return response
+    view_args = request.view_args or {}
+    uid = view_args.get("uid")
+    if not uid or request.endpoint.endswith((".search", ".copy_index")) or response.status_code >= 400:
+        return response
+    
+    data = (response.get_json(silent=True) or {}).get("data") if response.is_json else None
+    task_uids = []
+    if isinstance(data, dict):
+        task_uids = [t for t in data.get("taskUids") or [data.get("taskUid")] if t is not None]
+    if not task_uids:
+        # Async jobs track the tasks they enqueue themselves
+        return response
+    search_cache.track_tasks(view_args["project_id"], uid, task_uids)
+    task_watcher.watch(view_args["project_id"], task_uids)
+    return response
+
+
 @index_bp.route("", methods=["GET"])
 def get_indexes(project_id):
     """Get all indexes for a project"""
@@ -42,10 +76,10 @@ def get_index(project_id, uid):
         return jsonify({
             "success": True,
             "data": {
-                "uid": index.uid,
-                "primaryKey": index.primary_key,
-                "createdAt": index.created_at,
-                "updatedAt": index.updated_at,
+                "uid": index.get("uid"),
+                "primaryKey": index.get("primaryKey"),
+                "createdAt": index.get("createdAt"),
+                "updatedAt": index.get("updatedAt"),
                 "stats": stats,
             }
         })
@@ -90,6 +124,36 @@ def delete_index(project_id, uid):
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@index_bp.route("/<string:uid>/copy", methods=["POST"])
+def copy_index(project_id, uid):
+    """Copy an index with its settings and documents to another project (background job)"""
+    if not project_service.get_info(project_id):
+        return jsonify({"success": False, "error": "Project not found"}), 404
+    
+    data = request.get_json() or {}
+    target_project_id = data.get("targetProjectId")
+    if not target_project_id:
+        return jsonify({"success": False, "error": "Target project is required"}), 400
+    if not project_service.get_info(int(target_project_id)):
+        return jsonify({"success": False, "error": "Target project not found"}), 404
+    
+    target_uid = data.get("targetUid") or uid
+    if int(target_project_id) == project_id and target_uid == uid:
+        return jsonify({"success": False, "error": "Source and target index are the same"}), 400
+    
+    try:
+        job = job_service.submit(project_id, "copy-index", {
+            "uid": uid,
+            "targetProjectId": int(target_project_id),
+            "targetUid": target_uid,
+            "pageSize": data.get("pageSize"),
+            "copySettings": data.get("copySettings", True),
+        })
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    return jsonify({"success": True, "data": job.to_dict()}), 202
+
+
 @index_bp.route("/<string:uid>/stats", methods=["GET"])
 def get_index_stats(project_id, uid):
     """Get stats for an index"""
@@ -125,6 +189,69 @@ def get_documents(project_id, uid):
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@index_bp.route("/<string:uid>/documents/export", methods=["GET"])
+def export_documents(project_id, uid):
+    """Stream every document of an index as NDJSON or CSV, optionally gzipped"""
+    service = get_meilisearch_service(project_id)
+    if not service:
+        return jsonify({"success": False, "error": "Project not found"}), 404
+    
+    export_format = request.args.get("format", "ndjson").lower()
+    if export_format not in ("ndjson", "csv"):
+        return jsonify({"success": False, "error": "Unsupported format. Use ndjson or csv."}), 400
+    use_gzip = request.args.get("gzip", "false").lower() == "true"
+    page_size = request.args.get("pageSize", config.get("export", "page_size", default=1000), type=int)
+    fields = request.args.get("fields")
+    fields_list = fields.split(",") if fields else None
+    
+    try:
+        columns = None
+        if export_format == "csv":
+            columns = fields_list or service.get_field_names(uid)
+        pages = service.iter_document_pages(uid, page_size, fields_list)
+        first_page = next(pages, [])
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+    
+    def encode_pages():
+        if columns is not None:
+            yield _csv_rows([columns])
+        for page in chain_first(first_page, pages):
+            if columns is None:
+                yield "".join(json.dumps(doc, ensure_ascii=False) + "\n" for doc in page).encode("utf-8")
+            else:
+                yield _csv_rows([_csv_value(doc.get(col)) for col in columns] for doc in page)
+    
+    def generate():
+        try:
+            yield from iter_gzip(encode_pages(), use_gzip)
+        except Exception as e:
+            # Headers are already sent; end the stream and leave a trace in the log
+            logger.error(f"Export of index {uid} for project {project_id} aborted: {e}")
+    
+    filename = f"{uid}.{export_format}" + (".gz" if use_gzip else "")
+    mimetype = "application/gzip" if use_gzip else (
+        "application/x-ndjson" if export_format == "ndjson" else "text/csv")
+    return Response(generate(), mimetype=mimetype, headers={
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "X-Accel-Buffering": "no",
+    })
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def _csv_rows(rows):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
 @index_bp.route("/<string:uid>/documents/<string:doc_id>", methods=["GET"])
 def get_document(project_id, uid, doc_id):
     """Get a specific document"""
@@ -143,6 +270,17 @@ def get_document(project_id, uid, doc_id):
 @index_bp.route("/<string:uid>/documents", methods=["POST"])
 def add_documents(project_id, uid):
     """Add documents to an index"""
+    return _ingest_documents(project_id, uid, update=False)
+
+
+@index_bp.route("/<string:uid>/documents", methods=["PUT"])
+def update_documents(project_id, uid):
+    """Partially update documents in an index"""
+    return _ingest_documents(project_id, uid, update=True)
+
+
+def _ingest_documents(project_id, uid, update):
+    """Send documents from a JSON body through the ingestion engine"""
     service = get_meilisearch_service(project_id)
     if not service:
         return jsonify({"success": False, "error": "Project not found"}), 404
@@ -154,16 +292,27 @@ def add_documents(project_id, uid):
     if not documents:
         return jsonify({"success": False, "error": "Documents are required"}), 400
     
+    batch_size = config.get("ingestion", "batch_size", default=10000)
+    engine = IngestionEngine(service, uid, primary_key)
     try:
-        result = service.add_documents(uid, documents, primary_key)
+        batches = (documents[i:i + batch_size] for i in range(0, len(documents), batch_size))
+        result = engine.add_documents(batches, update=update)
         return jsonify({"success": True, "data": result}), 201
+    except IngestionBacklogError as e:
+        return jsonify({"success": False, "error": str(e), "data": engine.result()}), 503
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+        return jsonify({"success": False, "error": str(e), "data": engine.result()}), 500
 
 
 @index_bp.route("/<string:uid>/documents/upload", methods=["POST"])
 def upload_documents_file(project_id, uid):
-    """Add documents by uploading a JSON or CSV file"""
+    """Add documents by uploading a JSON, NDJSON or CSV file
+
+    The file is read incrementally and sent in batches, one task per batch.
+    NDJSON and CSV files are forwarded as raw bytes split at line boundaries
+    unless passthrough=false is given, in which case CSV rows are parsed.
+    With async=true the file is stored and imported by a background job.
+    """
     service = get_meilisearch_service(project_id)
     if not service:
         return jsonify({"success": False, "error": "Project not found"}), 404
@@ -172,38 +321,40 @@ def upload_documents_file(project_id, uid):
     if not file:
         return jsonify({"success": False, "error": "No file provided"}), 400
 
-    primary_key = request.form.get("primaryKey")
-    filename = file.filename.lower()
+    primary_key = request.form.get("primaryKey") or None
+    passthrough = request.form.get("passthrough", "true").lower() != "false"
 
-    try:
-        if filename.endswith(".json"):
-            content = file.read().decode("utf-8")
-            documents = json.loads(content)
-            if isinstance(documents, dict):
-                documents = [documents]
-        elif filename.endswith(".csv"):
-            import csv
-            import io
-            content = file.read().decode("utf-8")
-            reader = csv.DictReader(io.StringIO(content))
-            documents = [row for row in reader]
-        else:
-            return jsonify({"success": False, "error": "Unsupported file format. Only .json and .csv are supported."}), 400
+    if request.form.get("async", "false").lower() == "true":
+        try:
+            job = job_service.submit_upload(project_id, uid, file, primary_key, passthrough)
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
+        return jsonify({"success": True, "data": job.to_dict()}), 202
 
-        if not documents:
+    engine = IngestionEngine(service, uid, primary_key)
+    try:
+        result = import_file(engine, file.stream, file.filename, passthrough)
+        if not result["batches"]:
             return jsonify({"success": False, "error": "File contains no documents"}), 400
-
-        result = service.add_documents(uid, documents, primary_key if primary_key else None)
-        return jsonify({"success": True, "data": result, "count": len(documents)}), 201
+        return jsonify({"success": True, "data": result, "count": result["documents"]}), 201
+    except IngestionBacklogError as e:
+        return jsonify({"success": False, "error": str(e), "data": engine.result()}), 503
+    except IngestionError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
     except json.JSONDecodeError:
-        return jsonify({"success": False, "error": "Invalid JSON file format"}), 400
+        return jsonify({"success": False, "error": "Invalid JSON file format", "data": engine.result()}), 400
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+        return jsonify({"success": False, "error": str(e), "data": engine.result()}), 500
 
 
 @index_bp.route("/<string:uid>/documents/fetch-url", methods=["POST"])
 def fetch_documents_from_url(project_id, uid):
-    """Add documents by fetching from a remote URL and extracting a specific field"""
+    """Add documents by fetching from a remote URL and extracting a specific field
+
+    With stream=true the response body is parsed incrementally and documents
+    are sent in batches while the download is still running. With async=true
+    the streamed import runs as a background job.
+    """
     service = get_meilisearch_service(project_id)
     if not service:
         return jsonify({"success": False, "error": "Project not found"}), 404
@@ -213,10 +364,27 @@ def fetch_documents_from_url(project_id, uid):
     field_path = data.get("fieldPath", "")  # e.g. "data.items" or "results"
     primary_key = data.get("primaryKey")
     headers = data.get("headers", {})  # optional custom headers
+    stream = bool(data.get("stream", False))
 
     if not url:
         return jsonify({"success": False, "error": "URL is required"}), 400
 
+    if data.get("async"):
+        try:
+            job = job_service.submit(project_id, "import-url", {
+                "uid": uid,
+                "url": url,
+                "fieldPath": field_path,
+                "primaryKey": primary_key,
+                "headers": headers,
+            })
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
+        return jsonify({"success": True, "data": job.to_dict()}), 202
+
+    if stream:
+        return _fetch_documents_streaming(service, uid, url, field_path, primary_key, headers)
+
     try:
         resp = http_requests.get(url, headers=headers, timeout=30)
         resp.raise_for_status()
@@ -243,8 +411,12 @@ def fetch_documents_from_url(project_id, uid):
         if not documents:
             return jsonify({"success": False, "error": "No documents found at the specified field path"}), 400
 
-        result = service.add_documents(uid, documents, primary_key if primary_key else None)
+        batch_size = config.get("ingestion", "batch_size", default=10000)
+        batches = (documents[i:i + batch_size] for i in range(0, len(documents), batch_size))
+        result = IngestionEngine(service, uid, primary_key).add_documents(batches)
         return jsonify({"success": True, "data": result, "count": len(documents)}), 201
+    except IngestionBacklogError as e:
+        return jsonify({"success": False, "error": str(e)}), 503
     except http_requests.exceptions.Timeout:
         return jsonify({"success": False, "error": "Request timed out"}), 504
     except http_requests.exceptions.ConnectionError:
@@ -257,6 +429,34 @@ def fetch_documents_from_url(project_id, uid):
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+def _fetch_documents_streaming(service, uid, url, field_path, primary_key, headers):
+    """Stream a remote JSON body into the index in bounded batches"""
+    engine = IngestionEngine(service, uid, primary_key)
+
+    def error(message, status):
+        return jsonify({"success": False, "error": message, "data": engine.result()}), status
+
+    try:
+        result = import_url(engine, url, field_path, headers)
+        if not result["batches"]:
+            return error("No documents found at the specified field path", 400)
+        return jsonify({"success": True, "data": result, "count": result["documents"]}), 201
+    except IngestionBacklogError as e:
+        return error(str(e), 503)
+    except IngestionError as e:
+        return error(str(e), 400)
+    except http_requests.exceptions.Timeout:
+        return error("Request timed out", 504)
+    except http_requests.exceptions.ConnectionError:
+        return error("Failed to connect to the URL", 502)
+    except http_requests.exceptions.HTTPError as e:
+        return error(f"HTTP error: {e.response.status_code}", 502)
+    except json.JSONDecodeError:
+        return error("Response is not valid JSON", 400)
+    except Exception as e:
+        return error(str(e), 500)
+
+
 @index_bp.route("/<string:uid>/documents/<string:doc_id>", methods=["DELETE"])
 def delete_document(project_id, uid, doc_id):
     """Delete a document"""
@@ -280,6 +480,13 @@ def delete_documents(project_id, uid):
     
     data = request.get_json()
     
+    if data and data.get("async"):
+        try:
+            job = job_service.submit(project_id, "delete-documents", {"uid": uid, "ids": data.get("ids")})
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
+        return jsonify({"success": True, "data": job.to_dict()}), 202
+    
     if data and data.get("ids"):
         # Delete specific documents
         try:
@@ -298,52 +505,61 @@ def delete_documents(project_id, uid):
 
 # ==================== Search ====================
 
+# Search parameters forwarded to Meilisearch as-is
+SEARCH_PARAMS = (
+    "limit",
+    "offset",
+    "filter",
+    "sort",
+    "facets",
+    "attributesToRetrieve",
+    "attributesToHighlight",
+    "showRankingScore",
+    "showRankingScoreDetails",
+    "vector",
+    "hybrid",
+    "semanticRatio",
+)
+
+
+def build_search_params(data):
+    """Pick the supported search parameters from a request body"""
+    return {key: data[key] for key in SEARCH_PARAMS if key in data}
+
+
 @index_bp.route("/<string:uid>/search", methods=["POST"])
 def search(project_id, uid):
     """Search documents in an index"""
-    import logging
-    logger = logging.getLogger(__name__)
-    
     service = get_meilisearch_service(project_id)
     if not service:
         return jsonify({"success": False, "error": "Project not found"}), 404
     
     data = request.get_json()
-    logger.info(f"接收到的请求数据: {data}")
     query = data.get("q", "")
     
-    search_params = {}
-    if "limit" in data:
-        search_params["limit"] = data["limit"]
-    if "offset" in data:
-        search_params["offset"] = data["offset"]
-    if "filter" in data:
-        search_params["filter"] = data["filter"]
-    if "sort" in data:
-        search_params["sort"] = data["sort"]
-    if "facets" in data:
-        search_params["facets"] = data["facets"]
-    if "attributesToRetrieve" in data:
-        search_params["attributesToRetrieve"] = data["attributesToRetrieve"]
-    if "attributesToHighlight" in data:
-        search_params["attributesToHighlight"] = data["attributesToHighlight"]
-    if "showRankingScore" in data:
-        search_params["showRankingScore"] = data["showRankingScore"]
-    if "showRankingScoreDetails" in data:
-        search_params["showRankingScoreDetails"] = data["showRankingScoreDetails"]
-    if "vector" in data:
-        search_params["vector"] = data["vector"]
-    if "hybrid" in data:
-        search_params["hybrid"] = data["hybrid"]
-    if "semanticRatio" in data:
-        search_params["semanticRatio"] = data["semanticRatio"]
-    
-    logger.info(f"构建的搜索参数: {search_params}")
+    search_params = build_search_params(data)
+    started = time.perf_counter()
+    
+    use_cache = search_cache.enabled and data.get("cache", True) is not False
+    if use_cache:
+        # Pending writes are resolved by the project's task poller
+        task_watcher.watch(project_id, search_cache.pending_tasks(project_id, uid))
+        cached = search_cache.get(project_id, uid, query, search_params)
+        if cached is not None:
+            query_log.record(project_id, uid, query, search_params,
+                             (time.perf_counter() - started) * 1000, cached, cached=True)
+            return jsonify({"success": True, "data": cached, "cached": True})
     
     try:
         result = service.search(uid, query, search_params)
+        query_log.record(project_id, uid, query, search_params,
+                         (time.perf_counter() - started) * 1000, result)
+        if use_cache:
+            search_cache.set(project_id, uid, query, search_params, result)
         return jsonify({"success": True, "data": result})
     except Exception as e:
+        query_log.record(project_id, uid, query, search_params,
+                         (time.perf_counter() - started) * 1000, error=str(e))
         return jsonify({"success": False, "error": str(e)}), 500
 
 
@@ -0,0 +1,65 @@
+"""
+Background job API endpoints
+"""
+from flask import Blueprint, request, jsonify
+from backend.services import ProjectService, job_service
+
+job_bp = Blueprint("jobs", __name__, url_prefix="/api/projects/<int:project_id>/jobs")
+project_service = ProjectService()
+
+
+@job_bp.route("", methods=["GET"])
+def get_jobs(project_id):
+    """Get recent jobs for a project"""
+    status = request.args.get("status")
+    limit = request.args.get("limit", 50, type=int)
+    jobs = job_service.get_all(project_id, status=status, limit=limit)
+    return jsonify({"success": True, "data": [j.to_dict(include_result=False) for j in jobs]})
+
+
+@job_bp.route("", methods=["POST"])
+def submit_job(project_id):
+    """Submit a background job"""
+    if not project_service.get_info(project_id):
+        return jsonify({"success": False, "error": "Project not found"}), 404
+
+    data = request.get_json() or {}
+    job_type = data.get("type")
+    params = data.get("params") or {}
+
+    try:
+        job = job_service.submit(project_id, job_type, params)
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    return jsonify({"success": True, "data": job.to_dict()}), 202
+
+
+@job_bp.route("/<int:job_id>", methods=["GET"])
+def get_job(project_id, job_id):
+    """Get a job's status and result"""
+    job = job_service.get(project_id, job_id)
+    if not job:
+        return jsonify({"success": False, "error": "Job not found"}), 404
+    return jsonify({"success": True, "data": job.to_dict()})
+
+
+@job_bp.route("/<int:job_id>/progress", methods=["GET"])
+def get_job_progress(project_id, job_id):
+    """Get a job's status and latest progress report"""
+    job = job_service.get(project_id, job_id)
+    if not job:
+        return jsonify({"success": False, "error": "Job not found"}), 404
+    data = job.to_dict(include_result=False)
+    return jsonify({
+        "success": True,
+        "data": {"id": data["id"], "status": data["status"], "progress": data["progress"]},
+    })
+
+
+@job_bp.route("/<int:job_id>/cancel", methods=["POST"])
+def cancel_job(project_id, job_id):
+    """Request cancellation of a job"""
+    job = job_service.cancel(project_id, job_id)
+    if not job:
+        return jsonify({"success": False, "error": "Job not found"}), 404
+    return jsonify({"success": True, "data": job.to_dict()})
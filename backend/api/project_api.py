@@ -2,7 +2,7 @@
 Project API endpoints
 """
 from flask import Blueprint, request, jsonify
-from backend.services import ProjectService
+from backend.services import ProjectService, health_monitor
 
 project_bp = Blueprint("projects", __name__, url_prefix="/api/projects")
 project_service = ProjectService()
@@ -75,6 +75,12 @@ def delete_project(project_id):
     return jsonify({"success": True, "message": "Project deleted"})
 
 
+@project_bp.route("/cache/stats", methods=["GET"])
+def get_cache_stats():
+    """Get hit/miss counters for the in-memory project caches"""
+    return jsonify({"success": True, "data": project_service.get_cache_stats()})
+
+
 @project_bp.route("/test-connection", methods=["POST"])
 def test_connection():
     """Test connection to a Meilisearch instance"""
@@ -89,6 +95,34 @@ def test_connection():
     return jsonify(result)
 
 
+@project_bp.route("/health", methods=["GET"])
+def get_projects_health():
+    """Get the background monitor's health, latency and circuit state per project"""
+    return jsonify({"success": True, "data": health_monitor.get_all()})
+
+
+@project_bp.route("/<int:project_id>/health", methods=["GET"])
+def get_project_health(project_id):
+    """Get the monitored health of a project"""
+    state = health_monitor.get(project_id)
+    if state is None:
+        return jsonify({"success": False, "error": "Project is not monitored yet"}), 404
+    return jsonify({"success": True, "data": state})
+
+
+@project_bp.route("/dashboard", methods=["GET"])
+def get_dashboard():
+    """Get health, version and stats of all projects, collected in parallel"""
+    include_inactive = request.args.get("include_inactive", "false").lower() == "true"
+    refresh = request.args.get("refresh", "false").lower() == "true"
+    timeout = request.args.get("timeout", type=int)
+    try:
+        data = project_service.get_dashboard(include_inactive, timeout, refresh)
+        return jsonify({"success": True, "data": data})
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
 @project_bp.route("/<int:project_id>/stats", methods=["GET"])
 def get_project_stats(project_id):
     """Get stats for a project's Meilisearch instance"""
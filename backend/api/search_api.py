@@ -0,0 +1,100 @@
+"""
+Search API endpoints spanning several indexes
+"""
+import time
+from flask import Blueprint, request, jsonify
+from backend.services import ProjectService
+from backend.services.federated_search import federated_search
+from backend.api.index_api import build_search_params
+
+search_bp = Blueprint("search", __name__, url_prefix="/api")
+project_service = ProjectService()
+
+
+@search_bp.route("/projects/<int:project_id>/multi-search", methods=["POST"])
+def multi_search(project_id):
+    """Run many searches against a project in a single upstream request"""
+    service = project_service.get_meilisearch_client(project_id)
+    if not service:
+        return jsonify({"success": False, "error": "Project not found"}), 404
+    
+    data = request.get_json() or {}
+    entries = data.get("queries")
+    if not isinstance(entries, list) or not entries:
+        return jsonify({"success": False, "error": "Queries are required"}), 400
+    
+    queries = []
+    for position, entry in enumerate(entries):
+        index_uid = entry.get("indexUid") or entry.get("index")
+        if not index_uid:
+            return jsonify({"success": False, "error": f"Query {position} has no indexUid"}), 400
+        query = {"indexUid": index_uid, "q": entry.get("q", "")}
+        query.update(build_search_params(entry))
+        queries.append(query)
+    
+    try:
+        started = time.perf_counter()
+        result = service.multi_search(queries)
+        round_trip_ms = round((time.perf_counter() - started) * 1000, 2)
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+    
+    results = [
+        {
+            "indexUid": query["indexUid"],
+            "q": query["q"],
+            "processingTimeMs": item.get("processingTimeMs"),
+            "result": item,
+        }
+        for query, item in zip(queries, result.get("results", []))
+    ]
+    return jsonify({
+        "success": True,
+        "data": {
+            "results": results,
+            "count": len(results),
+            "roundTripMs": round_trip_ms,
+        },
+    })
+
+
+@search_bp.route("/search/federated", methods=["POST"])
+def search_federated():
+    """Search indexes of several projects in parallel and merge the hits"""
+    data = request.get_json() or {}
+    entries = data.get("targets")
+    if not isinstance(entries, list) or not entries:
+        return jsonify({"success": False, "error": "Targets are required"}), 400
+    
+    limit = data.get("limit", 20)
+    if type(limit) is not int or limit <= 0:
+        return jsonify({"success": False, "error": "limit must be a positive integer"}), 400
+    timeout_ms = data.get("timeoutMs")
+    if timeout_ms is not None and (type(timeout_ms) is not int or timeout_ms <= 0):
+        return jsonify({"success": False, "error": "timeoutMs must be a positive integer"}), 400
+    
+    targets = {}
+    for position, entry in enumerate(entries):
+        project_id = entry.get("projectId")
+        index_uid = entry.get("indexUid") or entry.get("index")
+        if not project_id or not index_uid:
+            return jsonify({"success": False, "error": f"Target {position} needs projectId and indexUid"}), 400
+        if project_id not in targets:
+            service = project_service.get_meilisearch_client(int(project_id))
+            if not service:
+                return jsonify({"success": False, "error": f"Project {project_id} not found"}), 404
+            targets[project_id] = (service, [])
+        if index_uid not in targets[project_id][1]:
+            targets[project_id][1].append(index_uid)
+    
+    try:
+        result = federated_search(
+            targets,
+            data.get("q", ""),
+            build_search_params(data),
+            limit=limit,
+            timeout_ms=timeout_ms,
+        )
+        return jsonify({"success": True, "data": result})
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
@@ -1,11 +1,18 @@
 """
 Task API endpoints
 """
-from flask import Blueprint, request, jsonify
-from backend.services import ProjectService
+import json
+import logging
+import time
+from flask import Blueprint, Response, request, jsonify
+from backend.services import ProjectService, job_service, search_cache, task_watcher, task_mirror
+from backend.services.task_mirror import LIST_FILTERS, DATE_FILTERS
+from backend.utils.config import config
+from backend.utils.document_stream import chain_first, iter_gzip
 
 task_bp = Blueprint("tasks", __name__, url_prefix="/api/projects/<int:project_id>/tasks")
 project_service = ProjectService()
+logger = logging.getLogger(__name__)
 
 
 def get_meilisearch_service(project_id):
@@ -13,6 +20,20 @@ def get_meilisearch_service(project_id):
     return project_service.get_meilisearch_client(project_id)
 
 
+def task_filters(args):
+    """Pick task filters (statuses, types, indexUids, uids, dates...) from query args"""
+    filters = {}
+    for key in LIST_FILTERS:
+        value = args.get(key)
+        if value:
+            values = value.split(",")
+            filters[key] = [int(v) for v in values] if key in ("uids", "canceledBy") else values
+    for key in DATE_FILTERS:
+        if args.get(key):
+            filters[key] = args[key]
+    return filters
+
+
 @task_bp.route("", methods=["GET"])
 def get_tasks(project_id):
     """Get tasks with optional filters"""
@@ -21,7 +42,7 @@ def get_tasks(project_id):
         return jsonify({"success": False, "error": "Project not found"}), 404
     
     # Build filter params
-    params = {}
+    params = task_filters(request.args)
     
     # Pagination
     limit = request.args.get("limit", type=int)
@@ -31,54 +52,54 @@ def get_tasks(project_id):
     if offset:
         params["from"] = offset
     
-    # Filter by status
-    statuses = request.args.get("statuses")
-    if statuses:
-        params["statuses"] = statuses.split(",")
-    
-    # Filter by type
-    types = request.args.get("types")
-    if types:
-        params["types"] = types.split(",")
-    
-    # Filter by index
-    index_uids = request.args.get("indexUids")
-    if index_uids:
-        params["indexUids"] = index_uids.split(",")
-    
-    # Filter by UID
-    uids = request.args.get("uids")
-    if uids:
-        params["uids"] = [int(uid) for uid in uids.split(",")]
-    
-    # Filter by date
-    before_enqueued_at = request.args.get("beforeEnqueuedAt")
-    after_enqueued_at = request.args.get("afterEnqueuedAt")
-    before_started_at = request.args.get("beforeStartedAt")
-    after_started_at = request.args.get("afterStartedAt")
-    before_finished_at = request.args.get("beforeFinishedAt")
-    after_finished_at = request.args.get("afterFinishedAt")
-    
-    if before_enqueued_at:
-        params["beforeEnqueuedAt"] = before_enqueued_at
-    if after_enqueued_at:
-        params["afterEnqueuedAt"] = after_enqueued_at
-    if before_started_at:
-        params["beforeStartedAt"] = before_started_at
-    if after_started_at:
-        params["afterStartedAt"] = after_started_at
-    if before_finished_at:
-        params["beforeFinishedAt"] = before_finished_at
-    if after_finished_at:
-        params["afterFinishedAt"] = after_finished_at
-    
     try:
         result = service.get_tasks(params if params else None)
+        search_cache.observe_tasks(project_id, result.get("results", []))
         return jsonify({"success": True, "data": result})
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@task_bp.route("/export", methods=["GET"])
+def export_tasks(project_id):
+    """Stream every task matching the filters as NDJSON, newest first, optionally gzipped"""
+    service = get_meilisearch_service(project_id)
+    if not service:
+        return jsonify({"success": False, "error": "Project not found"}), 404
+    
+    try:
+        filters = task_filters(request.args)
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    use_gzip = request.args.get("gzip", "false").lower() == "true"
+    page_size = request.args.get("pageSize", config.get("export", "page_size", default=1000), type=int)
+    
+    try:
+        pages = service.iter_task_pages(filters, page_size, request.args.get("from", type=int))
+        first_page = next(pages, [])
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+    
+    def encode_pages():
+        for page in chain_first(first_page, pages):
+            yield "".join(json.dumps(task, ensure_ascii=False) + "\n" for task in page).encode("utf-8")
+    
+    def generate():
+        try:
+            yield from iter_gzip(encode_pages(), use_gzip)
+        except Exception as e:
+            # Headers are already sent; end the stream and leave a trace in the log
+            logger.error(f"Task export for project {project_id} aborted: {e}")
+        finally:
+            pages.close()
+    
+    filename = f"tasks-{project_id}.ndjson" + (".gz" if use_gzip else "")
+    return Response(generate(), mimetype="application/gzip" if use_gzip else "application/x-ndjson", headers={
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "X-Accel-Buffering": "no",
+    })
+
+
 @task_bp.route("/<int:task_uid>", methods=["GET"])
 def get_task(project_id, task_uid):
     """Get a specific task"""
@@ -87,8 +108,11 @@ def get_task(project_id, task_uid):
         return jsonify({"success": False, "error": "Project not found"}), 404
     
     try:
-        task = service.get_task(task_uid)
+        # Coalesced with other lookups and watches into one /tasks request
+        task = task_watcher.get(project_id, task_uid)
         return jsonify({"success": True, "data": task})
+    except LookupError as e:
+        return jsonify({"success": False, "error": str(e)}), 404
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
@@ -144,6 +168,13 @@ def delete_tasks(project_id):
     if not params:
         return jsonify({"success": False, "error": "At least one filter is required"}), 400
     
+    # Keep the local history complete before tasks disappear upstream
+    if config.get("task_mirror", "sync_before_delete", default=True) and task_mirror.state(project_id):
+        try:
+            task_mirror.sync(project_id, service)
+        except Exception as e:
+            logger.warning(f"Could not sync task mirror of project {project_id} before deleting tasks: {e}")
+    
     try:
         result = service.delete_tasks(params)
         return jsonify({"success": True, "data": result})
@@ -159,10 +190,131 @@ def wait_for_task(project_id, task_uid):
         return jsonify({"success": False, "error": "Project not found"}), 404
     
     data = request.get_json() or {}
-    timeout = data.get("timeout", 5000)
+    timeout = data.get("timeout")
+    if timeout is not None and type(timeout) is not int:
+        return jsonify({"success": False, "error": "timeout must be an integer (ms)"}), 400
+    if not timeout or timeout <= 0:
+        timeout = config.get("tasks", "wait_timeout", default=5000)
+    
+    if data.get("async"):
+        try:
+            job = job_service.submit(project_id, "wait-task", {"taskUid": task_uid, "timeout": timeout})
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
+        return jsonify({"success": True, "data": job.to_dict()}), 202
+    
+    try:
+        # Holds a request worker, so bounded even when the client asks for more
+        timeout = min(timeout, config.get("tasks", "wait_max_timeout", default=60000))
+        result = task_watcher.wait(project_id, task_uid, timeout)
+        return jsonify({"success": True, "data": result})
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@task_bp.route("/stream", methods=["GET"])
+def stream_tasks(project_id):
+    """Stream status changes of tasks as server-sent events
+    
+    Emits a "task" event per change, then "done" once every task has
+    finished, or "timeout" when the stream's time budget runs out.
+    """
+    if not project_service.get_info(project_id):
+        return jsonify({"success": False, "error": "Project not found"}), 404
+    
+    try:
+        uids = [int(uid) for uid in request.args.get("uids", "").split(",") if uid]
+    except ValueError:
+        return jsonify({"success": False, "error": "uids must be comma-separated integers"}), 400
+    if not uids:
+        return jsonify({"success": False, "error": "uids is required"}), 400
+    
+    timeout = request.args.get("timeout", config.get("tasks", "stream_timeout", default=300000), type=int)
+    heartbeat = config.get("tasks", "stream_heartbeat", default=15)
+    
+    def generate():
+        # Subscribed on the first read, so a response that is never
+        # streamed leaves nothing behind; closing it runs the finally
+        subscription = task_watcher.subscribe(project_id, uids)
+        deadline = time.monotonic() + timeout / 1000
+        try:
+            while not subscription.done:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    yield "event: timeout\ndata: {}\n\n"
+                    return
+                task = subscription.get(min(heartbeat, remaining))
+                if task is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: task\ndata: {json.dumps(task, default=str)}\n\n"
+            # Changes queued alongside the last one
+            while True:
+                task = subscription.get(0)
+                if task is None:
+                    break
+                yield f"event: task\ndata: {json.dumps(task, default=str)}\n\n"
+            yield "event: done\ndata: {}\n\n"
+        finally:
+            task_watcher.unsubscribe(project_id, subscription)
+    
+    return Response(generate(), mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
+
+
+# ==================== Task mirror ====================
+
+@task_bp.route("/mirror/sync", methods=["POST"])
+def sync_task_mirror(project_id):
+    """Copy new and unfinished tasks into the local task history"""
+    service = get_meilisearch_service(project_id)
+    if not service:
+        return jsonify({"success": False, "error": "Project not found"}), 404
+    
+    data = request.get_json(silent=True) or {}
+    if data.get("async"):
+        try:
+            job = job_service.submit(project_id, "sync-tasks")
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
+        return jsonify({"success": True, "data": job.to_dict()}), 202
+    
+    try:
+        result = task_mirror.sync(project_id, service, max_pages=data.get("maxPages"))
+        return jsonify({"success": True, "data": result})
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@task_bp.route("/mirror", methods=["GET"])
+def get_mirrored_tasks(project_id):
+    """List tasks from the local history, with the same filters as GET /tasks"""
+    if not project_service.get_info(project_id):
+        return jsonify({"success": False, "error": "Project not found"}), 404
+    
+    try:
+        filters = task_filters(request.args)
+        limit = min(request.args.get("limit", 20, type=int), 1000)
+        result = task_mirror.query(project_id, filters, limit, request.args.get("from", type=int))
+        return jsonify({"success": True, "data": result})
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@task_bp.route("/mirror/stats", methods=["GET"])
+def get_mirrored_task_stats(project_id):
+    """Task counts, durations and failure rates per status, type and index"""
+    if not project_service.get_info(project_id):
+        return jsonify({"success": False, "error": "Project not found"}), 404
     
     try:
-        result = service.wait_for_task(task_uid, timeout)
+        result = task_mirror.stats(project_id, task_filters(request.args))
         return jsonify({"success": True, "data": result})
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
@@ -3,6 +3,7 @@ Flask application factory
 """
 import os
 import sys
+import time
 import logging
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
@@ -11,12 +12,28 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from flask import Flask, jsonify
+from flask import Flask, Response, g, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 
 from backend.utils.config import config
+from backend.utils.deadline import reset_deadline, set_deadline
+from backend.utils.metrics import metrics
+from backend.utils import timing
 from backend.models import db
-from backend.api import project_bp, index_bp, task_bp, key_bp
+from backend.api import project_bp, index_bp, task_bp, key_bp, job_bp, search_bp
+from backend.services import job_service, health_monitor
+
+
+slow_logger = logging.getLogger("backend.slow_requests")
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """JSON provider that reports serialization time in Server-Timing"""
+    
+    def dumps(self, obj, **kwargs):
+        with timing.timed("serialize"):
+            return super().dumps(obj, **kwargs)
 
 
 def setup_logging(app):
@@ -66,6 +83,17 @@ def setup_logging(app):
     werkzeug_logger.setLevel(log_level)
     werkzeug_logger.addHandler(file_handler)
     
+    # Slow requests also go to their own file
+    if not slow_logger.handlers:
+        slow_handler = RotatingFileHandler(
+            log_dir / config.get("timing", "slow_log_file", default="slow_requests.log"),
+            maxBytes=max_bytes,
+            backupCount=backup_count,
+            encoding="utf-8"
+        )
+        slow_handler.setFormatter(formatter)
+        slow_logger.addHandler(slow_handler)
+    
     app.logger.info(f"Logging initialized - Level: {log_config.get('level', 'INFO')}, Path: {log_path}")
 
 
@@ -77,6 +105,7 @@ def create_app(config_path: str = None):
         config.load_config(config_path)
     
     app = Flask(__name__)
+    app.json = TimedJSONProvider(app)
     
     # Setup logging
     setup_logging(app)
@@ -95,12 +124,16 @@ def create_app(config_path: str = None):
     # Initialize database
     with app.app_context():
         db.create_tables()
+        job_service.recover()
+    health_monitor.start()
     
     # Register blueprints
     app.register_blueprint(project_bp)
     app.register_blueprint(index_bp)
     app.register_blueprint(task_bp)
     app.register_blueprint(key_bp)
+    app.register_blueprint(job_bp)
+    app.register_blueprint(search_bp)
     
     # Health check endpoint
     @app.route("/api/health", methods=["GET"])
@@ -128,6 +161,75 @@ def create_app(config_path: str = None):
     def internal_error(error):
         return jsonify({"success": False, "error": "Internal server error"}), 500
     
+    # Time spent in the database, upstream calls and serialization per request
+    server_timing = config.get("timing", "server_timing", default=True)
+    slow_ms = config.get("timing", "slow_ms", default=1000)
+    
+    @app.before_request
+    def start_request_timing():
+        g.timing_token = timing.start_timing()
+    
+    @app.after_request
+    def add_server_timing(response):
+        timings = timing.current()
+        if timings is None:
+            return response
+        if server_timing:
+            response.headers["Server-Timing"] = timings.header()
+        breakdown = timings.to_dict()
+        if slow_ms and breakdown["total"] >= slow_ms:
+            project_id = (request.view_args or {}).get("project_id")
+            slow_logger.warning(
+                f"Slow request {request.method} {request.url_rule.rule if request.url_rule else request.path} "
+                f"project={project_id} status={response.status_code} path={request.path} "
+                f"timings={breakdown} counts={timings.counts}"
+            )
+        return response
+    
+    @app.teardown_request
+    def end_request_timing(exception=None):
+        token = g.pop("timing_token", None)
+        if token is not None:
+            timing.end_timing(token)
+    
+    # Cap the combined time of the upstream calls made by one request
+    request_deadline = config.get("meilisearch", "request_deadline", default=30)
+    
+    @app.before_request
+    def start_deadline():
+        g.deadline_token = set_deadline(request_deadline)
+    
+    @app.teardown_request
+    def clear_deadline(exception=None):
+        token = g.pop("deadline_token", None)
+        if token is not None:
+            reset_deadline(token)
+    
+    # Request counts, latency and in-flight gauges per route
+    @app.before_request
+    def start_request_metrics():
+        g.metrics_route = request.url_rule.rule if request.url_rule else "unmatched"
+        g.metrics_started = time.perf_counter()
+        metrics.request_started(request.method, g.metrics_route)
+    
+    @app.after_request
+    def set_request_status(response):
+        g.metrics_status = response.status_code
+        return response
+    
+    @app.teardown_request
+    def finish_request_metrics(exception=None):
+        route = g.pop("metrics_route", None)
+        if route is not None:
+            metrics.request_finished(request.method, route, g.pop("metrics_status", 500),
+                                     time.perf_counter() - g.metrics_started)
+    
+    if metrics.enabled:
+        @app.route(config.get("metrics", "path", default="/metrics"), methods=["GET"])
+        def prometheus_metrics():
+            body, content_type = metrics.render()
+            return Response(body, content_type=content_type)
+    
     # Teardown
     @app.teardown_appcontext
     def shutdown_session(exception=None):
@@ -3,5 +3,7 @@ Models package initialization
 """
 from .database import db, Base
 from .project import Project
+from .job import Job
+from .task_record import TaskRecord, TaskSyncState
 
-__all__ = ["db", "Base", "Project"]
+__all__ = ["db", "Base", "Project", "Job", "TaskRecord", "TaskSyncState"]
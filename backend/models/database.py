@@ -1,15 +1,28 @@
 """
 Database configuration and session management
 """
+import time
 from pathlib import Path
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, scoped_session, declarative_base
 from backend.utils.config import config
+from backend.utils import timing
 
 
 Base = declarative_base()
 
 
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if timing.current() is not None:
+        context._timing_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_timing_started", None)
+    if started is not None:
+        timing.record("db", time.perf_counter() - started)
+
+
 class Database:
     """Database manager for SQLAlchemy connections"""
     
@@ -47,6 +60,7 @@ class Database:
             raise ValueError(f"Unsupported database type: {db_type}")
         
         pool_size = db_config.get("pool_size", 10)
+        max_overflow = db_config.get("max_overflow", 10)
         pool_recycle = db_config.get("pool_recycle", 3600)
         
         if db_type == "sqlite":
@@ -58,10 +72,15 @@ class Database:
             self._engine = create_engine(
                 connection_string,
                 pool_size=pool_size,
+                max_overflow=max_overflow,
                 pool_recycle=pool_recycle,
                 echo=config.app.get("debug", False),
             )
         
+        # Query time of the current request, reported in Server-Timing
+        event.listen(self._engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(self._engine, "after_cursor_execute", _after_cursor_execute)
+        
         self._session_factory = scoped_session(
             sessionmaker(bind=self._engine, autocommit=False, autoflush=False)
         )
@@ -0,0 +1,61 @@
+"""
+Job model - represents a long-running admin operation
+"""
+import json
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean
+from .database import Base
+
+
+class Job(Base):
+    """Job model for background operations run outside the request thread"""
+
+    __tablename__ = "jobs"
+
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELED = "canceled"
+    FINISHED_STATUSES = (SUCCEEDED, FAILED, CANCELED)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    project_id = Column(Integer, nullable=False, index=True, comment="Project ID")
+    type = Column(String(50), nullable=False, comment="Job type")
+    status = Column(String(20), nullable=False, default=PENDING, index=True, comment="Job status")
+    params = Column(Text, nullable=True, comment="Job parameters (JSON)")
+    progress = Column(Text, nullable=True, comment="Latest progress report (JSON)")
+    result = Column(Text, nullable=True, comment="Job result (JSON)")
+    error = Column(Text, nullable=True, comment="Error message")
+    cancel_requested = Column(Boolean, default=False, comment="Whether cancellation was requested")
+    owner = Column(String(255), nullable=True, comment="host:pid of the worker running the job")
+    created_at = Column(DateTime, default=datetime.utcnow, comment="Creation time")
+    started_at = Column(DateTime, nullable=True, comment="Start time")
+    finished_at = Column(DateTime, nullable=True, comment="Finish time")
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, comment="Update time")
+
+    @staticmethod
+    def _load(value):
+        return json.loads(value) if value else None
+
+    def to_dict(self, include_result: bool = True):
+        """Convert to dictionary"""
+        data = {
+            "id": self.id,
+            "project_id": self.project_id,
+            "type": self.type,
+            "status": self.status,
+            "params": self._load(self.params),
+            "progress": self._load(self.progress),
+            "error": self.error,
+            "cancel_requested": self.cancel_requested,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+        if include_result:
+            data["result"] = self._load(self.result)
+        return data
+
+    def __repr__(self):
+        return f"<Job(id={self.id}, type='{self.type}', status='{self.status}')>"
@@ -0,0 +1,89 @@
+"""
+Task mirror models - local copies of Meilisearch tasks
+"""
+import json
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, Text, Float, Index, UniqueConstraint
+from .database import Base
+
+
+class TaskRecord(Base):
+    """Mirrored Meilisearch task, kept after the task is deleted upstream"""
+
+    __tablename__ = "task_records"
+    __table_args__ = (
+        UniqueConstraint("project_id", "uid", name="uq_task_records_project_uid"),
+        Index("ix_task_records_project_status", "project_id", "status"),
+        Index("ix_task_records_project_type", "project_id", "type"),
+        Index("ix_task_records_project_index", "project_id", "index_uid"),
+        Index("ix_task_records_project_enqueued", "project_id", "enqueued_at"),
+    )
+
+    FINISHED_STATUSES = ("succeeded", "failed", "canceled")
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    project_id = Column(Integer, nullable=False, comment="Project ID")
+    uid = Column(Integer, nullable=False, comment="Meilisearch task uid")
+    index_uid = Column(String(255), nullable=True, comment="Index UID")
+    status = Column(String(20), nullable=False, comment="Task status")
+    type = Column(String(50), nullable=False, comment="Task type")
+    canceled_by = Column(Integer, nullable=True, comment="uid of the cancelation task")
+    error_code = Column(String(100), nullable=True, comment="Error code of failed tasks")
+    error = Column(Text, nullable=True, comment="Error object (JSON)")
+    details = Column(Text, nullable=True, comment="Task details (JSON)")
+    duration_ms = Column(Float, nullable=True, comment="Processing duration in milliseconds")
+    duration = Column(String(50), nullable=True, comment="ISO 8601 duration as reported")
+    enqueued_at = Column(DateTime, nullable=True, comment="Enqueue time (UTC)")
+    started_at = Column(DateTime, nullable=True, comment="Start time (UTC)")
+    finished_at = Column(DateTime, nullable=True, comment="Finish time (UTC)")
+    synced_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, comment="Last sync time")
+
+    @staticmethod
+    def _isoformat(value):
+        return value.isoformat() + "Z" if value else None
+
+    def to_dict(self):
+        """Convert to a dictionary shaped like a Meilisearch task"""
+        return {
+            "uid": self.uid,
+            "indexUid": self.index_uid,
+            "status": self.status,
+            "type": self.type,
+            "canceledBy": self.canceled_by,
+            "details": json.loads(self.details) if self.details else None,
+            "error": json.loads(self.error) if self.error else None,
+            "duration": self.duration,
+            "durationMs": self.duration_ms,
+            "enqueuedAt": self._isoformat(self.enqueued_at),
+            "startedAt": self._isoformat(self.started_at),
+            "finishedAt": self._isoformat(self.finished_at),
+        }
+
+    def __repr__(self):
+        return f"<TaskRecord(project_id={self.project_id}, uid={self.uid}, status='{self.status}')>"
+
+
+class TaskSyncState(Base):
+    """Incremental sync cursor of a project's task mirror
+
+    Every task with uid <= last_uid has been mirrored. A walk over newer
+    tasks runs newest-first from the top uid it saw, and is resumed from
+    resume_from if it was interrupted.
+    """
+
+    __tablename__ = "task_sync_states"
+
+    project_id = Column(Integer, primary_key=True, autoincrement=False, comment="Project ID")
+    last_uid = Column(Integer, nullable=False, default=-1, comment="Highest uid mirrored without gaps")
+    walk_top = Column(Integer, nullable=True, comment="Newest uid of the walk in progress")
+    resume_from = Column(Integer, nullable=True, comment="Cursor to resume the walk from")
+    synced_at = Column(DateTime, nullable=True, comment="Last completed sync")
+
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            "project_id": self.project_id,
+            "last_uid": self.last_uid,
+            "in_progress": self.walk_top is not None,
+            "synced_at": self.synced_at.isoformat() if self.synced_at else None,
+        }
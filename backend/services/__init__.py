@@ -2,6 +2,40 @@
 Services package initialization
 """
 from .meilisearch_service import MeilisearchService
-from .project_service import ProjectService
+from .circuit_breaker import CircuitBreaker, CircuitOpenError, circuit_breakers
+from .client_registry import ClientRegistry, client_registry
+from .search_cache import SearchCache, search_cache
+from .project_service import ProjectService, ProjectInfo, project_cache
+from .ingestion_service import IngestionEngine, IngestionError, IngestionBacklogError
+from .job_service import JobService, JobContext, JobCancelled, job_service
+from .task_watcher import TaskWatcher, TaskSubscription, task_watcher
+from .task_mirror import TaskMirror, task_mirror
+from .health_monitor import HealthMonitor, health_monitor
 
-__all__ = ["MeilisearchService", "ProjectService"]
+__all__ = [
+    "MeilisearchService",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "circuit_breakers",
+    "ClientRegistry",
+    "client_registry",
+    "SearchCache",
+    "search_cache",
+    "ProjectService",
+    "ProjectInfo",
+    "project_cache",
+    "IngestionEngine",
+    "IngestionError",
+    "IngestionBacklogError",
+    "JobService",
+    "JobContext",
+    "JobCancelled",
+    "job_service",
+    "TaskWatcher",
+    "TaskSubscription",
+    "task_watcher",
+    "TaskMirror",
+    "task_mirror",
+    "HealthMonitor",
+    "health_monitor",
+]
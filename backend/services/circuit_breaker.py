@@ -0,0 +1,120 @@
+"""
+Per-project circuit breakers for upstream Meilisearch calls
+"""
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from backend.utils.config import config
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an instance whose circuit is open"""
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker around one Meilisearch instance
+
+    After failure_threshold consecutive connection failures the circuit
+    opens and calls fail immediately. Once reset_timeout has passed a
+    single trial call is let through (half-open); its outcome closes or
+    re-opens the circuit. Health probes report through the same methods.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 15.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def before_request(self) -> bool:
+        """Raise CircuitOpenError unless a call may go through now
+        
+        Returns True when the call is the half-open trial; its caller must
+        then record an outcome or call release_trial().
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return False
+            elapsed = time.monotonic() - self.opened_at
+            if self.state == self.OPEN and elapsed >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial = False
+            if self.state == self.HALF_OPEN and not self._trial:
+                self._trial = True
+                return True
+            retry_in = max(self.reset_timeout - elapsed, 0)
+        raise CircuitOpenError(f"{self.name} is unavailable (circuit open, retry in {retry_in:.0f}s)")
+
+    def release_trial(self):
+        """Let another trial through after one that ended without an outcome"""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._trial = False
+    
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self._trial = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current state for status endpoints"""
+        with self._lock:
+            data = {"state": self.state, "failures": self.failures}
+            if self.state != self.CLOSED:
+                data["retryInSeconds"] = round(
+                    max(self.reset_timeout - (time.monotonic() - self.opened_at), 0), 1)
+            return data
+
+
+class CircuitBreakerRegistry:
+    """Circuit breakers keyed by project ID"""
+
+    def __init__(self, enabled: bool = True, failure_threshold: int = 3, reset_timeout: float = 15.0):
+        self.enabled = enabled
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, project_id: int) -> Optional[CircuitBreaker]:
+        """Breaker for a project, or None when circuit breaking is disabled"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            breaker = self._breakers.get(project_id)
+            if breaker is None:
+                breaker = self._breakers[project_id] = CircuitBreaker(
+                    f"Project {project_id}", self.failure_threshold, self.reset_timeout
+                )
+            return breaker
+
+    def remove(self, project_id: int):
+        """Forget a project's breaker"""
+        with self._lock:
+            self._breakers.pop(project_id, None)
+
+
+# Global circuit breakers
+circuit_breakers = CircuitBreakerRegistry(
+    enabled=config.get("health", "circuit_breaker", default=True),
+    failure_threshold=config.get("health", "failure_threshold", default=3),
+    reset_timeout=config.get("health", "reset_timeout", default=15),
+)
@@ -0,0 +1,103 @@
+"""
+Process-wide registry of pooled MeilisearchService instances
+"""
+import threading
+from collections import OrderedDict
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from backend.utils.config import config
+from backend.services.meilisearch_service import DEFAULT_POLICY, MeilisearchService, RequestPolicy
+from backend.services.circuit_breaker import circuit_breakers
+
+
+class ClientRegistry:
+    """LRU registry of MeilisearchService instances keyed by project ID
+
+    Each entry owns a keep-alive requests.Session, so repeated API calls for
+    the same project reuse TCP/TLS connections instead of opening new ones.
+    """
+
+    def __init__(self, max_size: int = 64, pool_maxsize: int = 10, policy: RequestPolicy = None):
+        self.max_size = max_size
+        self.pool_maxsize = pool_maxsize
+        self.policy = policy or DEFAULT_POLICY
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _new_session(self) -> requests.Session:
+        """Create a session with a bounded keep-alive connection pool"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def get(self, project_id: int, url: str, api_key: str = None) -> MeilisearchService:
+        """Get the pooled service for a project, creating it if needed
+
+        An entry whose URL or API key no longer matches is replaced.
+        """
+        fingerprint = (url.rstrip("/"), api_key)
+        stale = None
+        with self._lock:
+            entry = self._entries.get(project_id)
+            if entry is not None:
+                if entry[0] == fingerprint:
+                    self._entries.move_to_end(project_id)
+                    return entry[1]
+                stale = entry[1]
+
+            service = MeilisearchService(
+                url, api_key, session=self._new_session(), project_id=project_id,
+                breaker=circuit_breakers.get(project_id), policy=self.policy,
+            )
+            self._entries[project_id] = (fingerprint, service)
+            self._entries.move_to_end(project_id)
+
+            evicted = []
+            while len(self._entries) > self.max_size:
+                _, (_, old) = self._entries.popitem(last=False)
+                evicted.append(old)
+
+        if stale is not None:
+            evicted.append(stale)
+        for old in evicted:
+            old.close()
+        return service
+
+    def invalidate(self, project_id: int) -> bool:
+        """Drop the pooled service for a project"""
+        with self._lock:
+            entry = self._entries.pop(project_id, None)
+        if entry is None:
+            return False
+        entry[1].close()
+        return True
+
+    def clear(self):
+        """Drop all pooled services"""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for _, service in entries:
+            service.close()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Global client registry
+client_registry = ClientRegistry(
+    max_size=config.get("meilisearch", "client_cache_size", default=64),
+    pool_maxsize=config.get("meilisearch", "pool_maxsize", default=10),
+    policy=RequestPolicy(
+        connect_timeout=config.get("meilisearch", "connect_timeout", default=DEFAULT_POLICY.connect_timeout),
+        read_timeout=config.get("meilisearch", "read_timeout", default=DEFAULT_POLICY.read_timeout),
+        write_timeout=config.get("meilisearch", "write_timeout", default=DEFAULT_POLICY.write_timeout),
+        retries=config.get("meilisearch", "retries", default=DEFAULT_POLICY.retries),
+        backoff=config.get("meilisearch", "retry_backoff", default=DEFAULT_POLICY.backoff),
+        backoff_max=config.get("meilisearch", "retry_backoff_max", default=DEFAULT_POLICY.backoff_max),
+    ),
+)
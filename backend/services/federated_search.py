@@ -0,0 +1,127 @@
+"""
+Federated search fanned out across several projects
+"""
+import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Tuple
+
+from backend.utils.config import config
+from backend.utils.deadline import DeadlineExceeded, request_deadline
+from backend.services.meilisearch_service import MeilisearchService
+
+
+# Shared pool so concurrent federated requests don't each spawn threads
+_executor = ThreadPoolExecutor(
+    max_workers=config.get("federated_search", "max_workers", default=16),
+    thread_name_prefix="federated",
+)
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def _search_project(service: MeilisearchService, index_uids: List[str], query: str,
+                    params: Dict[str, Any], expires_at: float) -> Tuple[List[Dict[str, Any]], float]:
+    """Search all requested indexes of one project in a single round trip
+    
+    The call runs under a deadline ending at expires_at, so a slow cluster
+    releases its pool worker when the caller gives up on it.
+    """
+    left = expires_at - time.monotonic()
+    if left <= 0:
+        raise DeadlineExceeded("Timed out before the search started")
+    started = time.perf_counter()
+    queries = [{"indexUid": uid, "q": query, **params} for uid in index_uids]
+    with request_deadline(left):
+        results = service.multi_search(queries).get("results", [])
+    return results, (time.perf_counter() - started) * 1000
+
+
+def _submit_search(project_id: int, service: MeilisearchService, index_uids: List[str], query: str,
+                   params: Dict[str, Any], expires_at: float) -> Future:
+    """Submit a project search, reusing an identical one already in flight"""
+    key = (project_id, tuple(index_uids), query, json.dumps(params, sort_keys=True, default=str))
+    with _inflight_lock:
+        future = _inflight.get(key)
+        if future is None:
+            future = _executor.submit(_search_project, service, index_uids, query, params, expires_at)
+            _inflight[key] = future
+            future.add_done_callback(lambda f: _search_done(key, f))
+        return future
+
+
+def _search_done(key, future: Future):
+    with _inflight_lock:
+        if _inflight.get(key) is future:
+            del _inflight[key]
+
+
+def federated_search(targets: Dict[int, Tuple[MeilisearchService, List[str]]], query: str,
+                     params: Dict[str, Any] = None, limit: int = 20,
+                     timeout_ms: int = None) -> Dict[str, Any]:
+    """Search several projects in parallel and merge hits by ranking score
+
+    targets maps project IDs to (service, index uids). Projects that fail or
+    do not answer within timeout_ms are reported per target and left out of
+    the merged hits, so a slow cluster only costs its own results.
+    """
+    timeout_ms = timeout_ms or config.get("federated_search", "timeout_ms", default=3000)
+    params = dict(params or {})
+    params["showRankingScore"] = True
+    params["limit"] = limit
+    params.pop("offset", None)
+
+    started = time.perf_counter()
+    expires_at = time.monotonic() + timeout_ms / 1000
+    futures = {
+        _submit_search(project_id, service, index_uids, query, params, expires_at): project_id
+        for project_id, (service, index_uids) in targets.items()
+    }
+    wait(futures, timeout=timeout_ms / 1000)
+
+    hits = []
+    report = []
+    for future, project_id in futures.items():
+        index_uids = targets[project_id][1]
+        if not future.done():
+            report.extend({"projectId": project_id, "indexUid": uid, "status": "timeout"}
+                          for uid in index_uids)
+            continue
+        try:
+            results, latency_ms = future.result()
+        except DeadlineExceeded:
+            report.extend({"projectId": project_id, "indexUid": uid, "status": "timeout"}
+                          for uid in index_uids)
+            continue
+        except Exception as e:
+            report.extend({"projectId": project_id, "indexUid": uid, "status": "error",
+                           "error": str(e)} for uid in index_uids)
+            continue
+        answered = set()
+        for result in results:
+            uid = result.get("indexUid")
+            answered.add(uid)
+            for hit in result.get("hits", []):
+                hit["_federation"] = {"projectId": project_id, "indexUid": uid}
+                hits.append(hit)
+            report.append({
+                "projectId": project_id,
+                "indexUid": uid,
+                "status": "ok",
+                "latencyMs": round(latency_ms, 2),
+                "processingTimeMs": result.get("processingTimeMs"),
+                "estimatedTotalHits": result.get("estimatedTotalHits", result.get("totalHits")),
+            })
+        report.extend({"projectId": project_id, "indexUid": uid, "status": "error",
+                       "error": "No result returned for this index"}
+                      for uid in index_uids if uid not in answered)
+
+    hits.sort(key=lambda hit: hit.get("_rankingScore") or 0.0, reverse=True)
+    return {
+        "hits": hits[:limit],
+        "limit": limit,
+        "targets": report,
+        "partial": any(t["status"] != "ok" for t in report),
+        "processingTimeMs": round((time.perf_counter() - started) * 1000, 2),
+    }
@@ -0,0 +1,152 @@
+"""
+Background health monitor for all active projects
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from backend.models import db, Project
+from backend.utils.config import config
+from backend.services.circuit_breaker import circuit_breakers
+from backend.services.client_registry import client_registry
+
+
+logger = logging.getLogger(__name__)
+
+
+class HealthMonitor:
+    """Probes every active project's /health on an interval
+
+    Keeps the latest health and latency per project and reports each probe
+    to the project's circuit breaker, so an open circuit closes as soon as
+    a probe gets through and a cluster that stops answering is cut off
+    without waiting for user requests to time out.
+    """
+
+    def __init__(self, enabled: bool = True, interval: float = 10, probe_timeout: float = 2,
+                 max_workers: int = 8):
+        self.enabled = enabled
+        self.interval = interval
+        self.probe_timeout = probe_timeout
+        self.max_workers = max_workers
+        self._states = {}
+        self._pid = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the monitor thread once per process"""
+        if not self.enabled:
+            return
+        with self._lock:
+            # gunicorn forks workers after import; each runs its own monitor
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            threading.Thread(target=self._run, name="health-monitor", daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+        with self._lock:
+            self._pid = None
+
+    def _run(self):
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="health-probe") as executor:
+            while not self._stop.is_set():
+                try:
+                    self.check_all(executor)
+                except Exception:
+                    logger.exception("Health check round failed")
+                self._stop.wait(self.interval)
+
+    def check_all(self, executor: ThreadPoolExecutor):
+        """Probe all active projects concurrently"""
+        try:
+            projects = [(p.id, p.name, p.url, p.api_key) for p in
+                        db.session.query(Project).filter(Project.is_active == True).all()]
+        finally:
+            db.close_session()
+
+        futures = [executor.submit(self.probe, *project) for project in projects]
+        wait(futures, timeout=self.probe_timeout * 2)
+        active = {project[0] for project in projects}
+        with self._lock:
+            for project_id in [pid for pid in self._states if pid not in active]:
+                del self._states[project_id]
+
+    def probe(self, project_id: int, name: str, url: str, api_key: str = None) -> Dict[str, Any]:
+        """Check one project's /health, bypassing its circuit breaker"""
+        service = client_registry.get(project_id, url, api_key)
+        breaker = circuit_breakers.get(project_id)
+        started = time.perf_counter()
+        healthy, error = False, None
+        try:
+            headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+            response = service.session.get(f"{service.url}/health", headers=headers,
+                                           timeout=self.probe_timeout)
+            healthy = response.status_code == 200 and response.json().get("status") == "available"
+            if not healthy:
+                error = f"HTTP {response.status_code}"
+        except Exception as e:
+            error = str(e)
+        latency_ms = round((time.perf_counter() - started) * 1000, 2)
+
+        if breaker is not None:
+            if healthy:
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+
+        with self._lock:
+            previous = self._states.get(project_id) or {}
+            state = {
+                "projectId": project_id,
+                "name": name,
+                "healthy": healthy,
+                "latencyMs": latency_ms,
+                "checkedAt": datetime.utcnow().isoformat(),
+                "error": error,
+                "consecutiveFailures": 0 if healthy else previous.get("consecutiveFailures", 0) + 1,
+                "lastHealthyAt": _last_healthy_at(previous, healthy),
+            }
+            self._states[project_id] = state
+        if previous and previous.get("healthy") != healthy:
+            log = logger.info if healthy else logger.warning
+            log(f"Project {project_id} ({name}) is now {'healthy' if healthy else 'unhealthy'}"
+                + (f": {error}" if error else ""))
+        return state
+
+    def get(self, project_id: int) -> Optional[Dict[str, Any]]:
+        """Latest health state of a project with its circuit, or None if not probed yet"""
+        with self._lock:
+            state = self._states.get(project_id)
+        if state is None:
+            return None
+        breaker = circuit_breakers.get(project_id)
+        return dict(state, circuit=breaker.snapshot() if breaker else None)
+
+    def get_all(self) -> List[Dict[str, Any]]:
+        """Latest health state of all monitored projects"""
+        with self._lock:
+            project_ids = sorted(self._states)
+        return [state for state in (self.get(pid) for pid in project_ids) if state is not None]
+
+
+def _last_healthy_at(previous: Dict[str, Any], healthy: bool) -> Optional[str]:
+    if healthy:
+        return datetime.utcnow().isoformat()
+    return previous.get("lastHealthyAt")
+
+
+# Global health monitor
+health_monitor = HealthMonitor(
+    enabled=config.get("health", "enabled", default=True),
+    interval=config.get("health", "interval", default=10),
+    probe_timeout=config.get("health", "probe_timeout", default=2),
+    max_workers=config.get("health", "max_workers", default=8),
+)
@@ -0,0 +1,216 @@
+"""
+Batched document ingestion with bounded concurrency
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, BinaryIO, Callable, Dict, Iterable, List, Tuple
+
+import requests
+
+from backend.utils.config import config
+from backend.utils.document_stream import (
+    JsonStreamReader, iter_json_documents, iter_csv_documents, iter_line_batches, iter_batches,
+)
+from backend.services.meilisearch_service import MeilisearchService
+
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionError(ValueError):
+    """Raised when a document source cannot be imported as requested"""
+
+
+class IngestionBacklogError(IngestionError):
+    """Raised when the task backlog stays above the limit for too long"""
+
+
+class IngestionEngine:
+    """Send document batches to an index over a bounded thread pool
+
+    At most `concurrency` batches are in flight, so a lazily produced source
+    (e.g. a streamed upload) is only read as fast as batches are accepted.
+    Submission pauses while the instance's enqueued-task backlog is above
+    `backlog_limit`, for at most `backlog_max_wait` seconds per pause.
+    """
+
+    def __init__(self, service: MeilisearchService, uid: str, primary_key: str = None,
+                 concurrency: int = None, backlog_limit: int = None,
+                 on_progress: Callable[[Dict[str, Any]], None] = None):
+        self.service = service
+        self.uid = uid
+        self.primary_key = primary_key or None
+        self.concurrency = max(1, concurrency or config.get("ingestion", "concurrency", default=4))
+        self.backlog_limit = backlog_limit if backlog_limit is not None else \
+            config.get("ingestion", "backlog_limit", default=1000)
+        self.backlog_check_interval = config.get("ingestion", "backlog_check_interval", default=2.0)
+        self.backlog_max_wait = config.get("ingestion", "backlog_max_wait", default=600)
+        self.on_progress = on_progress
+        self._batches = []
+        self._documents = 0
+        self._started_at = None
+        self._last_backlog_check = 0.0
+        self._lock = threading.Lock()
+
+    # ==================== Sources ====================
+
+    def add_documents(self, batches: Iterable[List[Dict]], update: bool = False) -> Dict[str, Any]:
+        """Add (or partially update) documents from an iterable of batches"""
+        send = self.service.update_documents if update else self.service.add_documents
+
+        def jobs():
+            for batch in batches:
+                yield (lambda b=batch: send(self.uid, b, self.primary_key)), len(batch)
+
+        return self._run(jobs())
+
+    def add_raw(self, batches: Iterable[Tuple[bytes, int]], content_type: str) -> Dict[str, Any]:
+        """Add documents from (payload, count) batches of encoded NDJSON or CSV"""
+        def jobs():
+            for payload, count in batches:
+                yield (lambda p=payload: self.service.add_documents_raw(
+                    self.uid, p, content_type, self.primary_key)), count
+
+        return self._run(jobs())
+
+    # ==================== Engine ====================
+
+    def result(self) -> Dict[str, Any]:
+        """Snapshot of the batches sent so far and the throughput"""
+        with self._lock:
+            batches = sorted(self._batches, key=lambda b: b["batch"])
+            documents = self._documents
+        elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+        return {
+            "taskUids": [b["taskUid"] for b in batches],
+            "batches": batches,
+            "documents": documents,
+            "elapsedMs": int(elapsed * 1000),
+            "documentsPerSecond": round(documents / elapsed, 1) if elapsed > 0 else 0.0,
+        }
+
+    def _run(self, jobs: Iterable[Tuple[Callable[[], Dict[str, Any]], int]]) -> Dict[str, Any]:
+        self._started_at = time.monotonic()
+        in_flight = set()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            try:
+                for number, (send, count) in enumerate(jobs):
+                    while len(in_flight) >= self.concurrency:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        self._collect(done)
+                    self._wait_for_backlog()
+                    future = executor.submit(send)
+                    future.batch = (number, count)
+                    in_flight.add(future)
+            finally:
+                # Let sent batches finish so the result reflects every task created
+                done, _ = wait(in_flight)
+                self._collect(done)
+        return self.result()
+
+    def _collect(self, futures):
+        """Record finished batches, re-raising the first failure"""
+        errors = []
+        for future in futures:
+            number, count = future.batch
+            try:
+                task = future.result()
+            except Exception as e:
+                errors.append(e)
+                continue
+            with self._lock:
+                self._batches.append({"batch": number, "taskUid": task["taskUid"], "count": count})
+                self._documents += count
+        if futures and len(errors) < len(futures):
+            progress = self.result()
+            logger.info(
+                f"Ingestion into '{self.uid}': {progress['documents']} documents in "
+                f"{len(progress['batches'])} batches, {progress['documentsPerSecond']} docs/s"
+            )
+            if self.on_progress:
+                self.on_progress(progress)
+        if errors:
+            raise errors[0]
+
+    def _wait_for_backlog(self):
+        """Pause while the instance has too many enqueued tasks"""
+        if not self.backlog_limit:
+            return
+        delay = self.backlog_check_interval
+        paused_at = None
+        while True:
+            now = time.monotonic()
+            if now - self._last_backlog_check < self.backlog_check_interval:
+                return
+            self._last_backlog_check = now
+            try:
+                enqueued = self.service.get_tasks({"statuses": ["enqueued"], "limit": 1}).get("total")
+            except Exception as e:
+                logger.warning(f"Could not read task backlog for '{self.uid}': {e}")
+                return
+            if enqueued is None or enqueued <= self.backlog_limit:
+                return
+            if paused_at is None:
+                paused_at = now
+            elif self.backlog_max_wait and now - paused_at >= self.backlog_max_wait:
+                raise IngestionBacklogError(
+                    f"Task backlog stayed above {self.backlog_limit} enqueued tasks for "
+                    f"{self.backlog_max_wait}s, stopped ingestion into '{self.uid}'"
+                )
+            logger.info(f"Task backlog at {enqueued} enqueued tasks, pausing ingestion into '{self.uid}'")
+            time.sleep(delay)
+            delay = min(delay * 2, 30)
+            self._last_backlog_check = 0.0
+
+
+# ==================== Sources ====================
+
+def import_file(engine: IngestionEngine, stream: BinaryIO, filename: str,
+                passthrough: bool = True) -> Dict[str, Any]:
+    """Import an uploaded JSON, NDJSON or CSV file through the engine
+
+    NDJSON and CSV files are forwarded as raw bytes split at line boundaries
+    unless passthrough is False, in which case CSV rows are parsed.
+    """
+    batch_size = config.get("ingestion", "batch_size", default=10000)
+    batch_bytes = config.get("ingestion", "batch_max_bytes", default=52428800)
+    filename = filename.lower()
+
+    if filename.endswith((".ndjson", ".jsonl")):
+        return engine.add_raw(iter_line_batches(stream, batch_bytes), "application/x-ndjson")
+    if filename.endswith(".csv") and passthrough:
+        return engine.add_raw(iter_line_batches(stream, batch_bytes, header=True, quote=b'"'), "text/csv")
+    if filename.endswith(".json"):
+        documents = iter_json_documents(stream)
+    elif filename.endswith(".csv"):
+        documents = iter_csv_documents(stream)
+    else:
+        raise IngestionError("Unsupported file format. Only .json, .ndjson and .csv are supported.")
+    return engine.add_documents(iter_batches(documents, batch_size, batch_bytes))
+
+
+def import_url(engine: IngestionEngine, url: str, field_path: str = "",
+               headers: Dict[str, str] = None) -> Dict[str, Any]:
+    """Stream a remote JSON body into the index while it downloads
+
+    Only the array at field_path is decoded, one document at a time.
+    """
+    batch_size = config.get("ingestion", "batch_size", default=10000)
+    batch_bytes = config.get("ingestion", "batch_max_bytes", default=52428800)
+    read_timeout = config.get("ingestion", "fetch_read_timeout", default=30)
+    path = [key.strip() for key in field_path.split(".")] if field_path else []
+
+    # The timeout applies to each read, not to the whole transfer
+    with requests.get(url, headers=headers or {}, stream=True, timeout=(10, read_timeout)) as resp:
+        resp.raise_for_status()
+        resp.raw.decode_content = True
+        reader = JsonStreamReader(resp.raw)
+
+        if not reader.descend(path):
+            raise IngestionError(f"Field path '{field_path}' not found in response")
+        if reader.peek() not in ("[", "{"):
+            raise IngestionError("Extracted data is not a list of documents")
+
+        return engine.add_documents(iter_batches(reader.iter_items(), batch_size, batch_bytes))
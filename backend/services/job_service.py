@@ -0,0 +1,410 @@
+"""
+Background job runner for long-running admin operations
+"""
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.models import db, Job
+from backend.utils.config import config
+
+
+logger = logging.getLogger(__name__)
+
+
+class JobCancelled(Exception):
+    """Raised inside a job once cancellation has been requested"""
+
+
+class JobContext:
+    """Handle passed to job handlers for progress reporting and cancellation"""
+
+    def __init__(self, job_id: int, project_id: int, params: Dict[str, Any]):
+        self.job_id = job_id
+        self.project_id = project_id
+        self.params = params
+        self.progress_interval = config.get("jobs", "progress_interval", default=1.0)
+        self._last_report = 0.0
+        self._last_check = 0.0
+        self._service = None
+        self._tracked = set()
+
+    @property
+    def service(self):
+        """MeilisearchService for the job's project"""
+        if self._service is None:
+            from backend.services.project_service import ProjectService
+            self._service = ProjectService().get_meilisearch_client(self.project_id)
+            if self._service is None:
+                raise LookupError("Project not found")
+        return self._service
+
+    def report(self, progress: Dict[str, Any], force: bool = False):
+        """Store a progress report, throttled to one write per interval"""
+        now = time.monotonic()
+        if not force and now - self._last_report < self.progress_interval:
+            return
+        self._last_report = now
+        session = db.session
+        session.query(Job).filter(Job.id == self.job_id).update(
+            {Job.progress: json.dumps(progress)}, synchronize_session=False
+        )
+        session.commit()
+
+    def cancelled(self) -> bool:
+        """Whether cancellation was requested (read at most once per interval)"""
+        now = time.monotonic()
+        if now - self._last_check < self.progress_interval:
+            return False
+        self._last_check = now
+        return bool(db.session.query(Job.cancel_requested).filter(Job.id == self.job_id).scalar())
+
+    def check_cancelled(self):
+        """Raise JobCancelled if cancellation was requested"""
+        if self.cancelled():
+            raise JobCancelled()
+
+    def track_tasks(self, uid: str, task_uids, project_id: int = None):
+        """Have the search cache and task watcher follow write tasks the job enqueued"""
+        from backend.services.search_cache import search_cache
+        from backend.services.task_watcher import task_watcher
+
+        project_id = project_id or self.project_id
+        new = [t for t in task_uids if t is not None and (project_id, t) not in self._tracked]
+        if not new:
+            return
+        self._tracked.update((project_id, t) for t in new)
+        search_cache.track_tasks(project_id, uid, new)
+        task_watcher.watch(project_id, new)
+
+    def wait_for_task(self, task_uid: int, timeout_ms: int = None) -> Dict[str, Any]:
+        """Wait for a Meilisearch task on the project's shared poller, reporting its status"""
+        from backend.services.task_watcher import task_watcher
+
+        def on_update(task):
+            if task is not None:
+                self.report({"taskUid": task_uid, "taskStatus": task.get("status")})
+            self.check_cancelled()
+
+        return task_watcher.wait(self.project_id, task_uid, timeout_ms,
+                                 on_update=on_update, interval=self.progress_interval)
+
+
+class JobService:
+    """Runs registered job handlers on a worker pool, tracking state in the jobs table"""
+
+    def __init__(self, max_workers: int = 2):
+        self.max_workers = max_workers
+        self._handlers = {}
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def owner(self) -> str:
+        # Resolved per call: gunicorn forks workers after import
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="job"
+                )
+            return self._executor
+
+    def handler(self, job_type: str, required: tuple = ()):
+        """Register a handler function(ctx) -> result for a job type"""
+        def decorator(fn: Callable[[JobContext], Any]):
+            self._handlers[job_type] = (fn, required)
+            return fn
+        return decorator
+
+    @property
+    def job_types(self) -> List[str]:
+        return sorted(self._handlers)
+
+    def validate(self, job_type: str, params: Dict[str, Any]) -> Optional[str]:
+        """Return an error message if the job cannot be submitted"""
+        if job_type not in self._handlers:
+            return f"Unknown job type '{job_type}'. Supported: {', '.join(self.job_types)}"
+        missing = [key for key in self._handlers[job_type][1] if params.get(key) in (None, "")]
+        if missing:
+            return f"Missing parameters: {', '.join(missing)}"
+        return None
+
+    # ==================== Lifecycle ====================
+
+    def submit(self, project_id: int, job_type: str, params: Dict[str, Any] = None) -> Job:
+        """Create a job and queue it on the worker pool
+
+        Raises ValueError if the type is unknown or parameters are missing.
+        """
+        error = self.validate(job_type, params or {})
+        if error:
+            raise ValueError(error)
+        session = db.session
+        job = Job(
+            project_id=project_id,
+            type=job_type,
+            status=Job.PENDING,
+            params=json.dumps(params or {}),
+            owner=self.owner,
+        )
+        session.add(job)
+        session.commit()
+        self._get_executor().submit(self._run, job.id)
+        return job
+
+    def submit_upload(self, project_id: int, uid: str, file, primary_key: str = None,
+                      passthrough: bool = True) -> Job:
+        """Store an uploaded file and queue a job that imports it"""
+        upload_dir = Path(config.get("jobs", "upload_dir", default="./data/uploads"))
+        upload_dir.mkdir(parents=True, exist_ok=True)
+        path = upload_dir / f"{uuid.uuid4().hex}{Path(file.filename).suffix.lower()}"
+        file.save(str(path))
+        try:
+            return self.submit(project_id, "import-file", {
+                "uid": uid,
+                "path": str(path),
+                "filename": file.filename,
+                "primaryKey": primary_key,
+                "passthrough": passthrough,
+            })
+        except ValueError:
+            path.unlink(missing_ok=True)
+            raise
+
+    def get(self, project_id: int, job_id: int) -> Optional[Job]:
+        """Get a job by ID"""
+        return db.session.query(Job).filter(
+            Job.id == job_id, Job.project_id == project_id
+        ).first()
+
+    def get_all(self, project_id: int, status: str = None, limit: int = 50) -> List[Job]:
+        """Get recent jobs for a project"""
+        query = db.session.query(Job).filter(Job.project_id == project_id)
+        if status:
+            query = query.filter(Job.status == status)
+        return query.order_by(Job.id.desc()).limit(limit).all()
+
+    def cancel(self, project_id: int, job_id: int) -> Optional[Job]:
+        """Request cancellation; pending jobs are canceled immediately"""
+        session = db.session
+        job = self.get(project_id, job_id)
+        if not job or job.status in Job.FINISHED_STATUSES:
+            return job
+        job.cancel_requested = True
+        session.commit()
+        # Only if no worker has started it in the meantime
+        session.query(Job).filter(Job.id == job_id, Job.status == Job.PENDING).update(
+            {Job.status: Job.CANCELED, Job.finished_at: datetime.utcnow()}, synchronize_session=False
+        )
+        session.commit()
+        session.refresh(job)
+        return job
+
+    def recover(self):
+        """Take over jobs left behind by worker processes that have exited
+
+        Pending jobs are re-queued here; running jobs are marked failed since
+        their progress cannot be resumed.
+        """
+        session = db.session
+        host = socket.gethostname()
+        try:
+            jobs = session.query(Job).filter(Job.status.in_([Job.PENDING, Job.RUNNING])).all()
+            for job in jobs:
+                if not self._owner_gone(job.owner, host):
+                    continue
+                if job.status == Job.RUNNING:
+                    claimed = session.query(Job).filter(
+                        Job.id == job.id, Job.owner == job.owner, Job.status == Job.RUNNING
+                    ).update({
+                        Job.status: Job.FAILED,
+                        Job.error: "Interrupted: the worker running this job exited",
+                        Job.finished_at: datetime.utcnow(),
+                    }, synchronize_session=False)
+                    session.commit()
+                else:
+                    claimed = session.query(Job).filter(
+                        Job.id == job.id, Job.owner == job.owner, Job.status == Job.PENDING
+                    ).update({Job.owner: self.owner}, synchronize_session=False)
+                    session.commit()
+                    if claimed:
+                        self._get_executor().submit(self._run, job.id)
+        finally:
+            db.close_session()
+
+    @staticmethod
+    def _owner_gone(owner: str, host: str) -> bool:
+        if not owner:
+            return True
+        owner_host, _, pid = owner.rpartition(":")
+        if owner_host != host or not pid.isdigit():
+            return False
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return True
+        except OSError:
+            return False
+        return False
+
+    def _run(self, job_id: int):
+        """Execute a job on a worker thread"""
+        session = db.session
+        try:
+            job = session.get(Job, job_id)
+            if not job:
+                return
+            entry = self._handlers.get(job.type)
+            if entry is None:
+                # Registered by another version of the app; fail it rather than leave it running
+                session.query(Job).filter(Job.id == job_id, Job.status == Job.PENDING).update({
+                    Job.status: Job.FAILED,
+                    Job.error: f"Unknown job type '{job.type}'",
+                    Job.finished_at: datetime.utcnow(),
+                }, synchronize_session=False)
+                session.commit()
+                return
+
+            # Conditional updates, so a cancel committed meanwhile is never overwritten
+            started = session.query(Job).filter(Job.id == job_id, Job.status == Job.PENDING).update(
+                {Job.status: Job.RUNNING, Job.started_at: datetime.utcnow()}, synchronize_session=False
+            )
+            session.commit()
+            if not started:
+                return
+
+            ctx = JobContext(job.id, job.project_id, json.loads(job.params or "{}"))
+            handler = entry[0]
+            status, result, error = Job.SUCCEEDED, None, None
+            try:
+                result = handler(ctx)
+            except JobCancelled:
+                status = Job.CANCELED
+            except Exception as e:
+                logger.exception(f"Job {job_id} ({job.type}) failed")
+                status, error = Job.FAILED, str(e)
+
+            session.rollback()
+            session.query(Job).filter(Job.id == job_id, Job.status != Job.CANCELED).update({
+                Job.status: status,
+                Job.result: json.dumps(result) if result is not None else None,
+                Job.error: error,
+                Job.finished_at: datetime.utcnow(),
+            }, synchronize_session=False)
+            session.commit()
+        except Exception:
+            logger.exception(f"Could not update state of job {job_id}")
+        finally:
+            db.close_session()
+
+
+# Global job service
+job_service = JobService(max_workers=config.get("jobs", "workers", default=2))
+
+
+# ==================== Handlers ====================
+
+def _ingestion_engine(ctx: JobContext):
+    from backend.services.ingestion_service import IngestionEngine
+
+    def on_progress(progress):
+        ctx.track_tasks(ctx.params["uid"], progress["taskUids"])
+        ctx.report(progress)
+        ctx.check_cancelled()
+
+    return IngestionEngine(ctx.service, ctx.params["uid"], ctx.params.get("primaryKey"),
+                           on_progress=on_progress)
+
+
+@job_service.handler("import-url", required=("uid", "url"))
+def _import_url_job(ctx: JobContext):
+    from backend.services.ingestion_service import import_url
+
+    engine = _ingestion_engine(ctx)
+    result = import_url(engine, ctx.params["url"], ctx.params.get("fieldPath", ""),
+                        ctx.params.get("headers"))
+    ctx.report(result, force=True)
+    return result
+
+
+@job_service.handler("import-file", required=("uid", "path", "filename"))
+def _import_file_job(ctx: JobContext):
+    from backend.services.ingestion_service import import_file
+
+    engine = _ingestion_engine(ctx)
+    path = ctx.params["path"]
+    try:
+        with open(path, "rb") as f:
+            result = import_file(engine, f, ctx.params["filename"],
+                                 ctx.params.get("passthrough", True))
+    finally:
+        Path(path).unlink(missing_ok=True)
+    ctx.report(result, force=True)
+    return result
+
+
+@job_service.handler("copy-index", required=("uid", "targetProjectId"))
+def _copy_index_job(ctx: JobContext):
+    from backend.services.project_service import ProjectService
+    from backend.services.migration_service import copy_index
+
+    target_id = int(ctx.params["targetProjectId"])
+    target = ProjectService().get_meilisearch_client(target_id)
+    if target is None:
+        raise LookupError("Target project not found")
+    target_uid = ctx.params.get("targetUid") or ctx.params["uid"]
+
+    def on_progress(progress):
+        task_uids = [progress.get("settingsTaskUid"), *progress.get("taskUids", ())]
+        ctx.track_tasks(target_uid, task_uids, project_id=target_id)
+        ctx.report(progress)
+        ctx.check_cancelled()
+
+    result = copy_index(
+        ctx.service, target, ctx.params["uid"],
+        target_uid=ctx.params.get("targetUid"),
+        page_size=ctx.params.get("pageSize"),
+        copy_settings=ctx.params.get("copySettings", True),
+        on_progress=on_progress,
+    )
+    ctx.track_tasks(target_uid, [result["settingsTaskUid"], *result["taskUids"]], project_id=target_id)
+    return result
+
+
+@job_service.handler("delete-documents", required=("uid",))
+def _delete_documents_job(ctx: JobContext):
+    uid = ctx.params["uid"]
+    ids = ctx.params.get("ids")
+    if ids:
+        task = ctx.service.delete_documents(uid, ids)
+    else:
+        task = ctx.service.delete_all_documents(uid)
+    ctx.track_tasks(uid, [task["taskUid"]])
+    return ctx.wait_for_task(task["taskUid"], ctx.params.get("timeout"))
+
+
+@job_service.handler("sync-tasks")
+def _sync_tasks_job(ctx: JobContext):
+    from backend.services.task_mirror import task_mirror
+
+    def on_progress(progress):
+        ctx.report(progress)
+        ctx.check_cancelled()
+
+    return task_mirror.sync(ctx.project_id, ctx.service, on_progress=on_progress)
+
+
+@job_service.handler("wait-task", required=("taskUid",))
+def _wait_task_job(ctx: JobContext):
+    return ctx.wait_for_task(int(ctx.params["taskUid"]), ctx.params.get("timeout"))
@@ -1,65 +1,316 @@
 """
 Meilisearch client service for interacting with Meilisearch instances
 """
+import random
+import threading
+import time
 import meilisearch
-from typing import Optional, Dict, Any, List
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
+from urllib.parse import urlencode
+from meilisearch._httprequests import HttpRequests
+from meilisearch.errors import MeilisearchApiError, MeilisearchCommunicationError, MeilisearchTimeoutError
+from typing import Optional, Dict, Any, List, Callable, Iterator, Tuple
+from backend.utils import deadline, timing
+from backend.utils.metrics import metrics
 
 
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+@lru_cache(maxsize=4096)
 def _snake_to_camel(name: str) -> str:
-    """Convert snake_case to camelCase"""
-    components = name.split('_')
-    return components[0] + ''.join(x.title() for x in components[1:])
+    """Convert snake_case to camelCase, keeping leading underscores (_vectors)"""
+    body = name.lstrip('_')
+    if '_' not in body:
+        return name
+    components = body.split('_')
+    return name[:len(name) - len(body)] + components[0] + ''.join(x.title() for x in components[1:])
+
+
+def _convert_key(key: Any) -> Any:
+    if type(key) is not str or '_' not in key:
+        return key
+    return _snake_to_camel(key)
+
+
+def _is_json_native(obj: Any, convert_keys: bool) -> bool:
+    """Whether obj is plain JSON data that _to_dict would return unchanged
+
+    Walks the payload without copying it (the response body is still
+    encoded afterwards); with convert_keys any key that would be renamed
+    also disqualifies it.
+    """
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        t = type(item)
+        if t in _SCALAR_TYPES:
+            continue
+        if t is dict:
+            for k, v in item.items():
+                if type(k) is not str or (convert_keys and '_' in k.lstrip('_')):
+                    return False
+                if type(v) not in _SCALAR_TYPES:
+                    stack.append(v)
+        elif t is list:
+            stack.extend(v for v in item if type(v) not in _SCALAR_TYPES)
+        else:
+            return False
+    return True
 
 
 def _to_dict(obj: Any, convert_keys: bool = True) -> Any:
-    """Convert Meilisearch objects to JSON-serializable dictionaries"""
-    if obj is None:
-        return None
-    if isinstance(obj, (str, int, float, bool)):
+    """Convert Meilisearch objects to JSON-serializable dictionaries
+
+    JSON-native payloads (as decoded from the HTTP response) are returned
+    as-is; only SDK model objects and tuples are rebuilt.
+    """
+    if type(obj) in _SCALAR_TYPES or _is_json_native(obj, convert_keys):
+        return obj
+    return _convert(obj, convert_keys)
+
+
+def _convert(obj: Any, convert_keys: bool) -> Any:
+    if type(obj) in _SCALAR_TYPES or isinstance(obj, (str, int, float)):
         return obj
     if isinstance(obj, dict):
-        if convert_keys:
-            return {_snake_to_camel(k): _to_dict(v, convert_keys) for k, v in obj.items()}
-        return {k: _to_dict(v, convert_keys) for k, v in obj.items()}
-    if isinstance(obj, (list, tuple)):
-        return [_to_dict(item, convert_keys) for item in obj]
-    if hasattr(obj, '__dict__'):
-        if convert_keys:
-            return {_snake_to_camel(k): _to_dict(v, convert_keys) for k, v in obj.__dict__.items() if not k.startswith('_')}
-        return {k: _to_dict(v, convert_keys) for k, v in obj.__dict__.items() if not k.startswith('_')}
-    
-    # 特殊处理Meilisearch搜索结果对象
-    if hasattr(obj, '_SearchResult__dict'):
-        # Meilisearch SearchResult对象
-        result_dict = {}
-        for attr in dir(obj):
-            if not attr.startswith('_') and not callable(getattr(obj, attr)):
+        items = obj.items()
+    elif isinstance(obj, (list, tuple)):
+        return [_convert(item, convert_keys) for item in obj]
+    elif hasattr(obj, 'model_dump'):
+        # SDK pydantic models (embedders, tasks) under their API field names
+        items = obj.model_dump(by_alias=True).items()
+    elif hasattr(obj, '__dict__'):
+        items = ((k, v) for k, v in obj.__dict__.items() if not k.startswith('_'))
+    else:
+        # Fallback for other types
+        return obj
+    if convert_keys:
+        return {_convert_key(k): _convert(v, convert_keys) for k, v in items}
+    return {k: _convert(v, convert_keys) for k, v in items}
+
+
+def _iter_prefetched(fetch_page: Callable[[Any], Tuple[List[Any], Any]], cursor: Any) -> Iterator[List[Any]]:
+    """Yield pages from fetch_page(cursor) -> (items, next_cursor)
+    
+    The next page is requested in the background while the caller is still
+    consuming the current one. Iteration stops when next_cursor is None.
+    """
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(fetch_page, cursor)
+        while future is not None:
+            items, cursor = future.result()
+            future = executor.submit(fetch_page, cursor) if cursor is not None else None
+            if items:
+                yield items
+
+
+# Timeouts in seconds; retries apply to GET requests only
+RequestPolicy = namedtuple("RequestPolicy", [
+    "connect_timeout", "read_timeout", "write_timeout", "retries", "backoff", "backoff_max",
+])
+DEFAULT_POLICY = RequestPolicy(connect_timeout=3, read_timeout=10, write_timeout=30,
+                               retries=2, backoff=0.1, backoff_max=2)
+
+# Upstream statuses worth retrying an idempotent request for
+_RETRY_STATUSES = (502, 503, 504)
+
+
+def _retryable(error: Exception) -> bool:
+    if isinstance(error, MeilisearchApiError):
+        return error.status_code in _RETRY_STATUSES
+    return isinstance(error, (MeilisearchCommunicationError, MeilisearchTimeoutError))
+
+
+def _outcome(error: Exception) -> bool:
+    """Whether a failed request still shows the instance is up"""
+    if isinstance(error, MeilisearchApiError):
+        return (error.status_code or 0) < 500
+    return not isinstance(error, (MeilisearchCommunicationError, MeilisearchTimeoutError))
+
+
+def _with_timeout(method: Callable, timeout: Tuple[float, float]) -> Callable:
+    """Wrap a session method so it uses timeout instead of the SDK's"""
+    def call(*args, **kwargs):
+        kwargs["timeout"] = timeout
+        return method(*args, **kwargs)
+    # The SDK dispatches on the method name
+    call.__name__ = method.__name__
+    return call
+
+
+class _PooledHttpRequests(HttpRequests):
+    """HttpRequests that sends through a shared keep-alive requests.Session
+    
+    Reads and writes get their own timeouts, both capped by the deadline of
+    the current request. GETs that hit a connection error, a timeout or a
+    502/503/504 are retried with jittered exponential backoff. With a
+    circuit breaker, calls to an instance known to be down fail
+    immediately, and a request that still fails with a connection error or
+    a 5xx after its retries counts once against it.
+    """
+    
+    def __init__(self, config, session, breaker=None, policy: RequestPolicy = None):
+        self._local = threading.local()
+        super().__init__(config)
+        self.session = session
+        self.breaker = breaker
+        self.policy = policy or DEFAULT_POLICY
+    
+    @property
+    def headers(self) -> Dict[str, str]:
+        # The SDK sets or pops Content-Type on self.headers before every
+        # call; give each thread its own copy so concurrent calls can't
+        # send each other's headers.
+        headers = getattr(self._local, "headers", None)
+        if headers is None:
+            headers = self._local.headers = dict(self._base_headers)
+        return headers
+    
+    @headers.setter
+    def headers(self, value: Dict[str, str]):
+        self._base_headers = dict(value)
+        self._local = threading.local()
+    
+    def send_request(self, http_method, *args, **kwargs):
+        # The SDK passes module-level functions such as requests.get;
+        # swap them for the session method of the same name.
+        method = getattr(self.session, http_method.__name__)
+        retries = self.policy.retries if http_method.__name__ == "get" else 0
+        # One breaker outcome per logical request, after any retries
+        trial = self.breaker.before_request() if self.breaker is not None else False
+        success = None
+        try:
+            attempt = 0
+            while True:
                 try:
-                    value = getattr(obj, attr)
-                    key = _snake_to_camel(attr) if convert_keys else attr
-                    result_dict[key] = _to_dict(value, convert_keys)
-                except:
-                    pass
-        return result_dict
-    
-    # Fallback for other types
-    return obj
+                    result = self._attempt(method, *args, **kwargs)
+                    success = True
+                    return result
+                except (MeilisearchApiError, MeilisearchCommunicationError, MeilisearchTimeoutError) as e:
+                    delay = random.uniform(0, min(self.policy.backoff_max, self.policy.backoff * 2 ** attempt))
+                    left = deadline.remaining()
+                    if attempt >= retries or not _retryable(e) or (left is not None and delay >= left):
+                        success = _outcome(e)
+                        raise
+                except deadline.DeadlineExceeded:
+                    # Our own deadline, not a sign that the instance is down
+                    raise
+                except Exception:
+                    success = True
+                    raise
+                attempt += 1
+                time.sleep(delay)
+        finally:
+            self._record(success, trial)
+    
+    def _attempt(self, method, *args, **kwargs):
+        """Send once with the operation timeout, capped by the request deadline"""
+        policy = self.policy
+        read_timeout = policy.read_timeout if method.__name__ == "get" else policy.write_timeout
+        left = deadline.check_deadline()
+        capped = left is not None and left < read_timeout
+        if capped:
+            read_timeout = left
+        method = _with_timeout(method, (min(policy.connect_timeout, read_timeout), read_timeout))
+        
+        started = time.perf_counter()
+        try:
+            return super().send_request(method, *args, **kwargs)
+        except MeilisearchTimeoutError as e:
+            if capped:
+                raise deadline.DeadlineExceeded("Request deadline exceeded") from e
+            raise
+        finally:
+            timing.record("upstream", time.perf_counter() - started)
+    
+    def _record(self, success: Optional[bool], trial: bool):
+        """Report a request's outcome to the breaker (None: no outcome)"""
+        if self.breaker is None:
+            return
+        if success is True:
+            self.breaker.record_success()
+        elif success is False:
+            self.breaker.record_failure()
+        elif trial:
+            # A half-open trial that ended without an outcome must not keep
+            # blocking later calls
+            self.breaker.release_trial()
+
 
+def _timed_operation(name: str, func: Callable) -> Callable:
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            result = func(self, *args, **kwargs)
+        except Exception as e:
+            metrics.observe_upstream(name, self.project_id, time.perf_counter() - started, e)
+            raise
+        metrics.observe_upstream(name, self.project_id, time.perf_counter() - started)
+        return result
+    return wrapper
 
+
+def _instrument_operations(cls):
+    """Record the latency of every public method in the upstream metrics
+    
+    iter_* methods are skipped since their work happens after they return.
+    """
+    for name, func in list(vars(cls).items()):
+        if callable(func) and not name.startswith(("_", "iter_")) and name != "close":
+            setattr(cls, name, _timed_operation(name, func))
+    return cls
+
+
+@_instrument_operations
 class MeilisearchService:
     """Service class for Meilisearch API interactions"""
     
-    def __init__(self, url: str, api_key: str = None):
+    def __init__(self, url: str, api_key: str = None, session=None, project_id: int = None,
+                 breaker=None, policy: RequestPolicy = None):
         """
         Initialize Meilisearch client
         
         Args:
             url: Meilisearch instance URL
             api_key: Master API key (optional)
+            session: Shared requests.Session to reuse connections (optional)
+            project_id: ID of the project this client belongs to (optional)
+            breaker: CircuitBreaker guarding pooled calls (optional)
+            policy: Timeouts and retries of pooled calls (optional)
         """
         self.url = url.rstrip("/")
         self.api_key = api_key
-        self.client = meilisearch.Client(self.url, self.api_key)
+        self.session = session
+        self.project_id = project_id
+        self.policy = policy or DEFAULT_POLICY
+        self.client = meilisearch.Client(self.url, self.api_key, timeout=self.policy.read_timeout)
+        self._http = None
+        if session is not None:
+            self._http = _PooledHttpRequests(self.client.config, session, breaker, self.policy)
+            self._bind(self.client)
+    
+    def _bind(self, obj):
+        """Route an SDK object's HTTP calls through the pooled session"""
+        if self._http is None:
+            return obj
+        obj.http = self._http
+        task_handler = getattr(obj, "task_handler", None)
+        if task_handler is not None:
+            task_handler.http = self._http
+        return obj
+    
+    def _index(self, uid: str):
+        """Get an index handle bound to this service's connection pool"""
+        return self._bind(self.client.index(uid))
+    
+    def close(self):
+        """Release pooled connections"""
+        if self.session is not None:
+            self.session.close()
     
     # ==================== Health & Stats ====================
     
@@ -88,15 +339,19 @@ class MeilisearchService:
                  "createdAt": idx.created_at, "updatedAt": idx.updated_at}
                 for idx in result.get("results", [])]
     
-    def get_index(self, uid: str):
-        """Get a specific index"""
-        return self.client.get_index(uid)
+    def get_index(self, uid: str) -> Dict[str, Any]:
+        """Get a specific index (uid, primaryKey, createdAt, updatedAt)"""
+        # Raw request: the SDK's get_index/create_index open their own
+        # connection instead of the pooled one
+        return self.client.http.get(f"indexes/{uid}")
     
     def create_index(self, uid: str, primary_key: str = None) -> Dict[str, Any]:
         """Create a new index"""
-        options = {"primaryKey": primary_key} if primary_key else {}
-        task = self.client.create_index(uid, options)
-        return {"taskUid": task.task_uid, "status": task.status}
+        body = {"uid": uid}
+        if primary_key:
+            body["primaryKey"] = primary_key
+        task = self.client.http.post("indexes", body)
+        return {"taskUid": task["taskUid"], "status": task["status"]}
     
     def delete_index(self, uid: str) -> Dict[str, Any]:
         """Delete an index"""
@@ -105,7 +360,7 @@ class MeilisearchService:
     
     def get_index_stats(self, uid: str) -> Dict[str, Any]:
         """Get stats for a specific index"""
-        index = self.client.index(uid)
+        index = self._index(uid)
         stats = index.get_stats()
         # Convert stats object to dict for JSON serialization
         return _to_dict(stats)
@@ -115,46 +370,82 @@ class MeilisearchService:
     def get_documents(self, uid: str, offset: int = 0, limit: int = 20, 
                       fields: List[str] = None) -> Dict[str, Any]:
         """Get documents from an index"""
-        index = self.client.index(uid)
         params = {"offset": offset, "limit": limit}
         if fields:
-            params["fields"] = fields
-        return index.get_documents(params)
+            params["fields"] = ",".join(fields)
+        # Raw page (results/offset/limit/total); the SDK's DocumentsResults
+        # model is not JSON-serializable
+        return self.client.http.get(f"indexes/{uid}/documents?{urlencode(params)}")
+    
+    def iter_document_pages(self, uid: str, page_size: int = 1000,
+                            fields: List[str] = None) -> Iterator[List[Dict[str, Any]]]:
+        """Walk every document of an index, one page of plain dicts at a time
+        
+        Pages are read with the raw HTTP client (no SDK model objects) and the
+        next page is prefetched while the current one is consumed.
+        """
+        def fetch_page(offset):
+            params = {"offset": offset, "limit": page_size}
+            if fields:
+                params["fields"] = ",".join(fields)
+            page = self.client.http.get(f"indexes/{uid}/documents?{urlencode(params)}")
+            results = page.get("results", [])
+            next_offset = offset + len(results)
+            if len(results) < page_size or next_offset >= page.get("total", 0):
+                next_offset = None
+            return results, next_offset
+        
+        return _iter_prefetched(fetch_page, 0)
+    
+    def get_field_names(self, uid: str) -> List[str]:
+        """Get the names of all fields present in an index"""
+        stats = self.client.http.get(f"indexes/{uid}/stats")
+        return sorted(stats.get("fieldDistribution", {}))
     
     def get_document(self, uid: str, document_id: str) -> Dict[str, Any]:
         """Get a specific document"""
-        index = self.client.index(uid)
+        index = self._index(uid)
         return index.get_document(document_id)
     
     def add_documents(self, uid: str, documents: List[Dict], 
                       primary_key: str = None) -> Dict[str, Any]:
         """Add or update documents"""
-        index = self.client.index(uid)
+        index = self._index(uid)
         task = index.add_documents(documents, primary_key)
         return {"taskUid": task.task_uid, "status": task.status}
     
+    def add_documents_raw(self, uid: str, payload: bytes, content_type: str,
+                          primary_key: str = None) -> Dict[str, Any]:
+        """Add or update documents from an encoded NDJSON or CSV payload
+        
+        The payload is sent as-is, without being parsed or re-serialized.
+        """
+        index = self._index(uid)
+        task = index.add_documents_raw(payload, primary_key, content_type)
+        return {"taskUid": task.task_uid, "status": task.status}
+    
     def update_documents(self, uid: str, documents: List[Dict],
                          primary_key: str = None) -> Dict[str, Any]:
         """Update documents"""
-        index = self.client.index(uid)
+        index = self._index(uid)
         task = index.update_documents(documents, primary_key)
         return {"taskUid": task.task_uid, "status": task.status}
     
     def delete_document(self, uid: str, document_id: str) -> Dict[str, Any]:
         """Delete a specific document"""
-        index = self.client.index(uid)
+        index = self._index(uid)
         task = index.delete_document(document_id)
         return {"taskUid": task.task_uid, "status": task.status}
     
     def delete_documents(self, uid: str, document_ids: List[str]) -> Dict[str, Any]:
         """Delete multiple documents"""
-        index = self.client.index(uid)
+        index = self._index(uid)
         task = index.delete_documents(document_ids)
         return {"taskUid": task.task_uid, "status": task.status}
     
     def delete_all_documents(self, uid: str) -> Dict[str, Any]:
         """Delete all documents from an index"""
-        index = self.client.index(uid)
+        index = self._index(uid)
         task = index.delete_all_documents()
         return {"taskUid": task.task_uid, "status": task.status}
     
@@ -162,172 +453,155 @@ class MeilisearchService:
     
     def search(self, uid: str, query: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
         """Search documents in an index"""
-        import logging
-        logger = logging.getLogger(__name__)
-        
-        index = self.client.index(uid)
-        search_params = params or {}
-        
-        # 记录搜索参数
-        logger.info(f"搜索参数: query='{query}', params={search_params}")
-        
-        result = index.search(query, search_params)
-        
-        # 记录原始结果类型和内容
-        logger.info(f"原始结果类型: {type(result)}")
-        if hasattr(result, '__dict__'):
-            logger.info(f"原始结果属性: {dir(result)}")
-        elif isinstance(result, dict):
-            logger.info(f"原始结果键: {list(result.keys())}")
-            if 'semanticHitCount' in result:
-                logger.info(f"✅ 找到 semanticHitCount: {result['semanticHitCount']}")
-        # 直接返回结果，因为已经是字典格式
-        # 只对嵌套的对象进行转换
+        result = self._index(uid).search(query, params or {})
         if isinstance(result, dict):
-            converted_result = {}
-            for key, value in result.items():
-                converted_result[key] = _to_dict(value, convert_keys=False)
-            return converted_result
-        else:
-            # 如果不是字典，使用原来的转换逻辑
-            return _to_dict(result, convert_keys=False)
+            return result
+        return _to_dict(result, convert_keys=False)
+    
+    def multi_search(self, queries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Run several searches in a single /multi-search request
+        
+        Each query is a dict with indexUid, q and search parameters.
+        """
+        return self.client.multi_search(queries)
     
     # ==================== Settings ====================
     
     def get_settings(self, uid: str) -> Dict[str, Any]:
         """Get all settings for an index"""
-        index = self.client.index(uid)
+        index = self._index(uid)
         settings = index.get_settings()
-        # Convert any non-serializable objects to dicts
-        return _to_dict(settings)
+        # Map keys are kept as-is so user-defined names (synonyms, embedders)
+        # round-trip unchanged; embedder models are dumped with their API names
+        return _to_dict(settings, convert_keys=False)
     
     def update_settings(self, uid: str, settings: Dict[str, Any]) -> Dict[str, Any]:
         """Update settings for an index"""
-        index = self.client.index(uid)
+        index = self._index(uid)
         task = index.update_settings(settings)
         return {"taskUid": task.task_uid, "status": task.status}
     
     def reset_settings(self, uid: str) -> Dict[str, Any]:
         """Reset settings to default"""
-        index = self.client.index(uid)
+        index = self._index(uid)
         task = index.reset_settings()
         return {"taskUid": task.task_uid, "status": task.status}
     
     # Individual settings
     def get_searchable_attributes(self, uid: str) -> List[str]:
-        index = self.client.index(uid)
+        index = self._index(uid)
         return index.get_searchable_attributes()
     
     def update_searchable_attributes(self, uid: str, attrs: List[str]) -> Dict[str, Any]:
-        index = self.client.index(uid)
+        index = self._index(uid)
         task = index.update_searchable_attributes(attrs)
         return {"taskUid": task.task_uid, "status": task.status}
     
     def get_displayed_attributes(self, uid: str) -> List[str]:
-        index = self.client.index(uid)
+        index = self._index(uid)
         return index.get_displayed_attributes()
     
     def update_displayed_attributes(self, uid: str, attrs: List[str]) -> Dict[str, Any]:
-        index = self.client.index(uid)
+        index = self._index(uid)
         task = index.update_displayed_attributes(attrs)
         return {"taskUid": task.task_uid, "status": task.status}
     
     def get_filterable_attributes(self, uid: str) -> List[str]:
-        index = self.client.index(uid)
+        index = self._index(uid)
         return index.get_filterable_attributes()
     
     def update_filterable_attributes(self, uid: str, attrs: List[str]) -> Dict[str, Any]:
-        index = self.client.index(uid)
+        index = self._index(uid)
         task = index.update_filterable_attributes(attrs)
         return {"taskUid": task.task_uid, "status": task.status}
     
     def get_sortable_attributes(self, uid: str) -> List[str]:
-        index = self.client.index(uid)
+        index = self._index(uid)
         return index.get_sortable_attributes()
     
     def update_sortable_attributes(self, uid: str, attrs: List[str]) -> Dict[str, Any]:
-        index = self.client.index(uid)
+        index = self._index(uid)
         task = index.update_sortable_attributes(attrs)
         return {"taskUid": task.task_uid, "status": task.status}
     
     def get_ranking_rules(self, uid: str) -> List[str]:
-        index = self.client.index(uid)
+        index = self._index(uid)
         return index.get_ranking_rules()
     
     def update_ranking_rules(self, uid: str, rules: List[str]) -> Dict[str, Any]:
-        index = self.client.index(uid)
+        index = self._index(uid)
         task = index.update_ranking_rules(rules)
         return {"taskUid": task.task_uid, "status": task.status}
     
     def get_synonyms(self, uid: str) -> Dict[str, List[str]]:
-        index = self.client.index(uid)
+        index = self._index(uid)
         return index.get_synonyms()
     
     def update_synonyms(self, uid: str, synonyms: Dict[str, List[str]]) -> Dict[str, Any]:
-        index = self.client.index(uid)
+        index = self._index(uid)
         task = index.update_synonyms(synonyms)
         return {"taskUid": task.task_uid, "status": task.status}
     
     def get_stop_words(self, uid: str) -> List[str]:
-        index = self.client.index(uid)
+        index = self._index(uid)
         return index.get_stop_words()
     
     def update_stop_words(self, uid: str, stop_words: List[str]) -> Dict[str, Any]:
-        index = self.client.index(uid)
+        index = self._index(uid)
         task = index.update_stop_words(stop_words)
         return {"taskUid": task.task_uid, "status": task.status}
     
     def get_typo_tolerance(self, uid: str) -> Dict[str, Any]:
-        index = self.client.index(uid)
+        index = self._index(uid)
         return index.get_typo_tolerance()
     
     def update_typo_tolerance(self, uid: str, typo_tolerance: Dict[str, Any]) -> Dict[str, Any]:
-        index = self.client.index(uid)
+        index = self._index(uid)
         task = index.update_typo_tolerance(typo_tolerance)
         return {"taskUid": task.task_uid, "status": task.status}
     
     def get_pagination(self, uid: str) -> Dict[str, int]:
-        index = self.client.index(uid)
+        index = self._index(uid)
         return index.get_pagination()
     
     def update_pagination(self, uid: str, pagination: Dict[str, int]) -> Dict[str, Any]:
-        index = self.client.index(uid)
+        index = self._index(uid)
         task = index.update_pagination(pagination)
         return {"taskUid": task.task_uid, "status": task.status}
     
     def get_faceting(self, uid: str) -> Dict[str, Any]:
-        index = self.client.index(uid)
+        index = self._index(uid)
         return index.get_faceting()
     
     def update_faceting(self, uid: str, faceting: Dict[str, Any]) -> Dict[str, Any]:
-        index = self.client.index(uid)
+        index = self._index(uid)
         task = index.update_faceting(faceting)
         return {"taskUid": task.task_uid, "status": task.status}
     
     def get_dictionary(self, uid: str) -> List[str]:
-        index = self.client.index(uid)
+        index = self._index(uid)
         return index.get_dictionary()
     
     def update_dictionary(self, uid: str, dictionary: List[str]) -> Dict[str, Any]:
-        index = self.client.index(uid)
+        index = self._index(uid)
         task = index.update_dictionary(dictionary)
         return {"taskUid": task.task_uid, "status": task.status}
     
     def get_separator_tokens(self, uid: str) -> List[str]:
-        index = self.client.index(uid)
+        index = self._index(uid)
         return index.get_separator_tokens()
     
     def update_separator_tokens(self, uid: str, tokens: List[str]) -> Dict[str, Any]:
-        index = self.client.index(uid)
+        index = self._index(uid)
         task = index.update_separator_tokens(tokens)
         return {"taskUid": task.task_uid, "status": task.status}
     
     def get_non_separator_tokens(self, uid: str) -> List[str]:
-        index = self.client.index(uid)
+        index = self._index(uid)
         return index.get_non_separator_tokens()
     
     def update_non_separator_tokens(self, uid: str, tokens: List[str]) -> Dict[str, Any]:
-        index = self.client.index(uid)
+        index = self._index(uid)
         task = index.update_non_separator_tokens(tokens)
         return {"taskUid": task.task_uid, "status": task.status}
     
@@ -335,9 +609,33 @@ class MeilisearchService:
     
     def get_tasks(self, params: Dict[str, Any] = None) -> Dict[str, Any]:
         """Get tasks with optional filters"""
+        if params:
+            # List filters are sent comma-separated; the SDK only joins strings
+            params = {k: ",".join(str(v) for v in value) if isinstance(value, (list, tuple)) else value
+                      for k, value in params.items()}
         result = self.client.get_tasks(params)
         return _to_dict(result)
     
+    def iter_task_pages(self, params: Dict[str, Any] = None, page_size: int = 1000,
+                        from_uid: int = None) -> Iterator[List[Dict[str, Any]]]:
+        """Walk the task list newest-first with the from/next cursor
+        
+        Filters are the same as get_tasks. Pages are plain dicts from the raw
+        HTTP client, and the next page is prefetched while the current one
+        is consumed.
+        """
+        filters = {k: ",".join(str(v) for v in value) if isinstance(value, (list, tuple)) else value
+                   for k, value in (params or {}).items() if k not in ("limit", "from")}
+        
+        def fetch_page(cursor):
+            query = dict(filters, limit=page_size)
+            if cursor is not None:
+                query["from"] = cursor
+            page = self.client.http.get(f"tasks?{urlencode(query)}")
+            return page.get("results", []), page.get("next")
+        
+        return _iter_prefetched(fetch_page, from_uid)
+    
     def get_task(self, task_uid: int) -> Dict[str, Any]:
         """Get a specific task"""
         result = self.client.get_task(task_uid)
@@ -355,7 +653,8 @@ class MeilisearchService:
     
     def wait_for_task(self, task_uid: int, timeout_in_ms: int = 5000) -> Dict[str, Any]:
         """Wait for a task to complete"""
-        return self.client.wait_for_task(task_uid, timeout_in_ms)
+        result = self.client.wait_for_task(task_uid, timeout_in_ms)
+        return _to_dict(result)
     
     # ==================== Keys ====================
     
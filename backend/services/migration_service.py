@@ -0,0 +1,71 @@
+"""
+Index copy/migration between Meilisearch instances
+"""
+import logging
+from typing import Any, Callable, Dict
+
+from meilisearch.errors import MeilisearchApiError
+
+from backend.utils.config import config
+from backend.services.meilisearch_service import MeilisearchService
+from backend.services.ingestion_service import IngestionEngine
+
+
+logger = logging.getLogger(__name__)
+
+
+def copy_index(source: MeilisearchService, target: MeilisearchService, uid: str,
+               target_uid: str = None, page_size: int = None, copy_settings: bool = True,
+               on_progress: Callable[[Dict[str, Any]], None] = None) -> Dict[str, Any]:
+    """Copy an index with its settings and all documents to another instance
+
+    Source pages are prefetched while earlier pages are still being written,
+    and writes go through an IngestionEngine, so reads and batched writes
+    overlap. Target tasks are enqueued in order (create, settings,
+    documents), which Meilisearch processes sequentially per index.
+    """
+    target_uid = target_uid or uid
+    page_size = page_size or config.get("export", "page_size", default=1000)
+    report = on_progress or (lambda progress: None)
+
+    index = source.get_index(uid)
+    primary_key = index.get("primaryKey")
+    total = source.get_index_stats(uid).get("numberOfDocuments")
+
+    try:
+        target.get_index(target_uid)
+    except MeilisearchApiError as e:
+        if e.code != "index_not_found":
+            raise
+        target.create_index(target_uid, primary_key)
+
+    settings_task = None
+    if copy_settings:
+        report({"phase": "settings", "documents": 0, "total": total})
+        settings = {k: v for k, v in source.get_settings(uid).items() if v is not None}
+        settings_task = target.update_settings(target_uid, settings)["taskUid"]
+
+    def on_batch(progress):
+        report({
+            "phase": "documents",
+            "documents": progress["documents"],
+            "total": total,
+            "documentsPerSecond": progress["documentsPerSecond"],
+            "settingsTaskUid": settings_task,
+            "taskUids": progress["taskUids"],
+        })
+
+    engine = IngestionEngine(target, target_uid, primary_key, on_progress=on_batch)
+    result = engine.add_documents(source.iter_document_pages(uid, page_size))
+    logger.info(
+        f"Copied {result['documents']} documents from '{uid}' to '{target_uid}' "
+        f"at {result['documentsPerSecond']} docs/s"
+    )
+    return {
+        "sourceUid": uid,
+        "targetUid": target_uid,
+        "primaryKey": primary_key,
+        "settingsTaskUid": settings_task,
+        "total": total,
+        **result,
+    }
@@ -1,16 +1,88 @@
 """
 Project service for managing project CRUD operations
 """
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from typing import List, Optional, Dict, Any
 from backend.models import db, Project
+from backend.utils.config import config
+from backend.utils.cache import TTLCache
 from backend.services.meilisearch_service import MeilisearchService
+from backend.services.client_registry import client_registry
+from backend.services.circuit_breaker import circuit_breakers
+from backend.services.search_cache import search_cache
+
+
+# Connection details needed by the proxy endpoints, cached outside the ORM
+ProjectInfo = namedtuple("ProjectInfo", ["id", "url", "api_key", "is_active"])
+
+# Global project metadata cache
+project_cache = TTLCache(
+    max_size=config.get("cache", "project_max_size", default=256),
+    ttl=config.get("cache", "project_ttl", default=30),
+    name="projects",
+)
+
+# Per-project dashboard entries (health, version, stats)
+dashboard_cache = TTLCache(
+    max_size=config.get("dashboard", "cache_max_size", default=256),
+    ttl=config.get("dashboard", "cache_ttl", default=10),
+    name="dashboard",
+)
+
+# Shared pool for dashboard collection; a hung cluster holds at most one
+# worker since collections already in flight are reused, not resubmitted
+_dashboard_executor = ThreadPoolExecutor(
+    max_workers=config.get("dashboard", "max_workers", default=16),
+    thread_name_prefix="dashboard",
+)
+_dashboard_inflight = {}
+_dashboard_lock = threading.Lock()
+
+
+def _collect_stats(project_id: int, service: MeilisearchService) -> Dict[str, Any]:
+    """Read health, version and stats of one instance and cache the entry"""
+    started = time.perf_counter()
+    try:
+        healthy = service.is_healthy()
+        entry = {"healthy": healthy}
+        if healthy:
+            entry["version"] = service.get_version()
+            entry["stats"] = service.get_stats()
+        else:
+            entry["error"] = "Instance is not healthy"
+    except Exception as e:
+        entry = {"healthy": False, "error": str(e)}
+    entry["latencyMs"] = round((time.perf_counter() - started) * 1000, 2)
+    dashboard_cache.set(project_id, entry)
+    return entry
+
+
+def _submit_collection(project_id: int, service: MeilisearchService) -> Future:
+    with _dashboard_lock:
+        future = _dashboard_inflight.get(project_id)
+        if future is None:
+            future = _dashboard_executor.submit(_collect_stats, project_id, service)
+            _dashboard_inflight[project_id] = future
+            future.add_done_callback(lambda f: _dashboard_done(project_id, f))
+        return future
+
+
+def _dashboard_done(project_id: int, future: Future):
+    with _dashboard_lock:
+        if _dashboard_inflight.get(project_id) is future:
+            del _dashboard_inflight[project_id]
 
 
 class ProjectService:
     """Service for project management operations"""
     
-    def __init__(self):
-        self.session = db.session
+    @property
+    def session(self):
+        # Resolved per call so the service can be shared across threads
+        return db.session
     
     def get_all(self, include_inactive: bool = False) -> List[Project]:
         """Get all projects"""
@@ -23,6 +95,19 @@ class ProjectService:
         """Get project by ID"""
         return self.session.query(Project).filter(Project.id == project_id).first()
     
+    def get_info(self, project_id: int) -> Optional[ProjectInfo]:
+        """Get cached connection details for a project"""
+        info = project_cache.get(project_id)
+        if info is not None:
+            return info
+        
+        project = self.get_by_id(project_id)
+        if not project:
+            return None
+        info = ProjectInfo(project.id, project.url, project.api_key, project.is_active)
+        project_cache.set(project_id, info)
+        return info
+    
     def create(self, name: str, url: str, api_key: str = None, 
                description: str = None) -> Project:
         """Create a new project"""
@@ -34,6 +119,7 @@ class ProjectService:
         )
         self.session.add(project)
         self.session.commit()
+        project_cache.invalidate(project.id)
         return project
     
     def update(self, project_id: int, **kwargs) -> Optional[Project]:
@@ -49,6 +135,12 @@ class ProjectService:
                 setattr(project, key, value)
         
         self.session.commit()
+        project_cache.invalidate(project_id)
+        if kwargs.get("url") is not None or kwargs.get("api_key") is not None:
+            client_registry.invalidate(project_id)
+            circuit_breakers.remove(project_id)
+            search_cache.invalidate_project(project_id)
+            dashboard_cache.invalidate(project_id)
         return project
     
     def delete(self, project_id: int) -> bool:
@@ -59,6 +151,11 @@ class ProjectService:
         
         project.is_active = False
         self.session.commit()
+        project_cache.invalidate(project_id)
+        client_registry.invalidate(project_id)
+        circuit_breakers.remove(project_id)
+        search_cache.invalidate_project(project_id)
+        dashboard_cache.invalidate(project_id)
         return True
     
     def hard_delete(self, project_id: int) -> bool:
@@ -69,19 +166,33 @@ class ProjectService:
         
         self.session.delete(project)
         self.session.commit()
+        project_cache.invalidate(project_id)
+        client_registry.invalidate(project_id)
+        circuit_breakers.remove(project_id)
+        search_cache.invalidate_project(project_id)
+        dashboard_cache.invalidate(project_id)
         return True
     
     def get_meilisearch_client(self, project_id: int) -> Optional[MeilisearchService]:
-        """Get MeilisearchService instance for a project"""
-        project = self.get_by_id(project_id)
-        if not project:
+        """Get the pooled MeilisearchService instance for a project"""
+        info = self.get_info(project_id)
+        if not info:
             return None
-        return MeilisearchService(project.url, project.api_key)
+        return client_registry.get(info.id, info.url, info.api_key)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters for the project and client caches"""
+        return {
+            "projects": project_cache.stats(),
+            "clients": {"size": len(client_registry), "maxSize": client_registry.max_size},
+            "search": search_cache.stats(),
+            "dashboard": dashboard_cache.stats(),
+        }
     
     def test_connection(self, url: str, api_key: str = None) -> Dict[str, Any]:
         """Test connection to a Meilisearch instance"""
         try:
-            service = MeilisearchService(url, api_key)
+            service = MeilisearchService(url, api_key, policy=client_registry.policy)
             if service.is_healthy():
                 version = service.get_version()
                 stats = service.get_stats()
@@ -101,16 +212,58 @@ class ProjectService:
         if not service:
             return None
         
-        try:
-            stats = service.get_stats()
-            version = service.get_version()
-            return {
-                "version": version,
-                "stats": stats,
-                "healthy": service.is_healthy(),
-            }
-        except Exception as e:
-            return {"error": str(e), "healthy": False}
+        entry = _collect_stats(project_id, service)
+        return {k: v for k, v in entry.items() if k != "latencyMs"}
+    
+    def get_dashboard(self, include_inactive: bool = False, timeout_ms: int = None,
+                      refresh: bool = False) -> Dict[str, Any]:
+        """Collect health, version and stats of all projects in parallel
+        
+        Entries are cached for dashboard.cache_ttl seconds. Projects that
+        don't answer within timeout_ms are reported as timed out and their
+        result is cached for the next call once it arrives.
+        """
+        timeout_ms = timeout_ms or config.get("dashboard", "timeout_ms", default=3000)
+        started = time.perf_counter()
+        projects = self.get_all(include_inactive=include_inactive)
+        
+        entries = {}
+        futures = {}
+        for project in projects:
+            cached = None if refresh else dashboard_cache.get(project.id)
+            if cached is not None:
+                entries[project.id] = dict(cached, cached=True)
+                continue
+            service = client_registry.get(project.id, project.url, project.api_key)
+            futures[project.id] = _submit_collection(project.id, service)
+        
+        wait(list(futures.values()), timeout=timeout_ms / 1000)
+        for project_id, future in futures.items():
+            if future.done():
+                entries[project_id] = dict(future.result(), cached=False)
+            else:
+                entries[project_id] = {"healthy": None, "timedOut": True,
+                                       "error": f"No response within {timeout_ms}ms"}
+        
+        items = []
+        for project in projects:
+            entry = entries[project.id]
+            items.append({"id": project.id, "name": project.name, "url": project.url,
+                          "isActive": project.is_active, **entry})
+        
+        indexes = [idx for item in items for idx in (item.get("stats") or {}).get("indexes", {}).values()]
+        return {
+            "projects": items,
+            "summary": {
+                "projects": len(items),
+                "healthy": sum(1 for item in items if item.get("healthy")),
+                "unreachable": sum(1 for item in items if not item.get("healthy")),
+                "indexes": len(indexes),
+                "documents": sum(idx.get("numberOfDocuments", 0) for idx in indexes),
+                "databaseSize": sum((item.get("stats") or {}).get("databaseSize", 0) for item in items),
+            },
+            "processingTimeMs": round((time.perf_counter() - started) * 1000, 2),
+        }
     
     def get_experimental_features(self, project_id: int) -> Optional[Dict[str, Any]]:
         """Get experimental features status for a project's Meilisearch instance"""
@@ -0,0 +1,124 @@
+"""
+Search response cache with task-aware invalidation
+"""
+import json
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+from backend.utils.config import config
+from backend.utils.cache import TTLCache
+
+
+FINISHED_TASK_STATUSES = ("succeeded", "failed", "canceled")
+
+
+class SearchCache:
+    """LRU/TTL cache of search responses keyed on (project, index, q, params)
+
+    Invalidation bumps a per-index (or per-project) generation that is part
+    of every key, so stale entries are never served and simply age out.
+    Write tasks enqueued through the admin are tracked per index: while any
+    is unfinished the index bypasses the cache, and once one succeeds the
+    index's entries are invalidated. Task states are fed in by the task
+    watcher's pollers and by task API responses.
+    """
+
+    def __init__(self, enabled: bool = False, max_size: int = 1000, ttl: float = 60):
+        self.enabled = enabled
+        self._cache = TTLCache(max_size=max_size, ttl=ttl, name="search")
+        self._generations = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def _key(self, project_id: int, uid: str, query: str, params: Dict[str, Any]) -> tuple:
+        normalized = json.dumps(params or {}, sort_keys=True, separators=(",", ":"), default=str)
+        with self._lock:
+            generation = (self._generations.get(project_id, 0), self._generations.get((project_id, uid), 0))
+        return project_id, uid, generation, query or "", normalized
+
+    def get(self, project_id: int, uid: str, query: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Get a cached response, or None if missing, expired or writes are pending"""
+        if self.pending_tasks(project_id, uid):
+            return None
+        return self._cache.get(self._key(project_id, uid, query, params))
+
+    def set(self, project_id: int, uid: str, query: str, params: Dict[str, Any], result: Dict[str, Any]):
+        """Cache a response unless writes to the index are pending"""
+        if self.pending_tasks(project_id, uid):
+            return
+        self._cache.set(self._key(project_id, uid, query, params), result)
+
+    def invalidate_index(self, project_id: int, uid: str):
+        """Drop all cached responses for an index"""
+        with self._lock:
+            key = (project_id, uid)
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    def invalidate_project(self, project_id: int):
+        """Drop all cached responses for a project"""
+        with self._lock:
+            self._generations[project_id] = self._generations.get(project_id, 0) + 1
+            for key in [k for k in self._pending if k[0] == project_id]:
+                del self._pending[key]
+
+    # ==================== Task tracking ====================
+
+    def track_tasks(self, project_id: int, uid: str, task_uids: Iterable[int]):
+        """Record write tasks enqueued for an index and invalidate it"""
+        task_uids = [t for t in task_uids if t is not None]
+        with self._lock:
+            if task_uids:
+                self._pending.setdefault((project_id, uid), set()).update(task_uids)
+        self.invalidate_index(project_id, uid)
+
+    def pending_tasks(self, project_id: int, uid: str) -> List[int]:
+        """Task uids tracked for an index that have not been seen finishing"""
+        with self._lock:
+            return sorted(self._pending.get((project_id, uid), ()))
+
+    def observe_tasks(self, project_id: int, tasks: Iterable[Dict[str, Any]]):
+        """Update tracked tasks from task payloads returned by Meilisearch"""
+        for task in tasks:
+            if not isinstance(task, dict) or task.get("status") not in FINISHED_TASK_STATUSES:
+                continue
+            uid = task.get("indexUid")
+            with self._lock:
+                pending = self._pending.get((project_id, uid))
+                if not pending or task.get("uid") not in pending:
+                    continue
+                pending.discard(task["uid"])
+                if not pending:
+                    del self._pending[(project_id, uid)]
+            if task["status"] == "succeeded":
+                self.invalidate_index(project_id, uid)
+
+    def discard_tasks(self, project_id: int, task_uids: Iterable[int]):
+        """Stop tracking tasks that no longer exist and invalidate their indexes"""
+        task_uids = set(task_uids)
+        emptied = []
+        with self._lock:
+            for key in [k for k in self._pending if k[0] == project_id]:
+                pending = self._pending[key]
+                if pending & task_uids:
+                    pending -= task_uids
+                    if not pending:
+                        del self._pending[key]
+                    emptied.append(key[1])
+        for uid in emptied:
+            self.invalidate_index(project_id, uid)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get size and hit/miss counters"""
+        stats = self._cache.stats()
+        stats["enabled"] = self.enabled
+        with self._lock:
+            stats["pendingTasks"] = sum(len(p) for p in self._pending.values())
+        return stats
+
+
+# Global search cache
+search_cache = SearchCache(
+    enabled=config.get("cache", "search_enabled", default=False),
+    max_size=config.get("cache", "search_max_size", default=1000),
+    ttl=config.get("cache", "search_ttl", default=60),
+)
@@ -0,0 +1,308 @@
+"""
+Local mirror of Meilisearch task history for filtering and analytics
+"""
+import json
+import logging
+import re
+import threading
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import case, func
+from sqlalchemy.exc import IntegrityError
+
+from backend.models import db, TaskRecord, TaskSyncState
+from backend.utils.config import config
+from backend.services.meilisearch_service import MeilisearchService
+
+
+logger = logging.getLogger(__name__)
+
+
+_DURATION_RE = re.compile(
+    r"^P(?:(?P<d>\d+(?:\.\d+)?)D)?"
+    r"(?:T(?:(?P<h>\d+(?:\.\d+)?)H)?(?:(?P<m>\d+(?:\.\d+)?)M)?(?:(?P<s>\d+(?:\.\d+)?)S)?)?$"
+)
+
+# Task list filters understood by both Meilisearch and the mirror
+LIST_FILTERS = ("uids", "statuses", "types", "indexUids", "canceledBy")
+DATE_FILTERS = {
+    "beforeEnqueuedAt": ("enqueued_at", "<"),
+    "afterEnqueuedAt": ("enqueued_at", ">"),
+    "beforeStartedAt": ("started_at", "<"),
+    "afterStartedAt": ("started_at", ">"),
+    "beforeFinishedAt": ("finished_at", "<"),
+    "afterFinishedAt": ("finished_at", ">"),
+}
+
+
+def parse_duration_ms(value: Optional[str]) -> Optional[float]:
+    """Convert an ISO 8601 duration such as PT0.012345S to milliseconds"""
+    if not value:
+        return None
+    match = _DURATION_RE.match(value)
+    if not match:
+        return None
+    parts = {k: float(v) for k, v in match.groupdict().items() if v}
+    seconds = (parts.get("d", 0) * 86400 + parts.get("h", 0) * 3600
+               + parts.get("m", 0) * 60 + parts.get("s", 0))
+    return round(seconds * 1000, 3)
+
+
+def parse_datetime(value: Any) -> Optional[datetime]:
+    """Parse an RFC 3339 timestamp (nanosecond precision allowed) to naive UTC"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        text = value.strip().replace("Z", "+00:00")
+        # Python accepts at most microseconds
+        text = re.sub(r"(\.\d{6})\d+", r"\1", text)
+        value = datetime.fromisoformat(text)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class TaskMirror:
+    """Copies a project's tasks into the task_records table
+
+    Syncs are incremental: new tasks are walked newest-first with
+    MeilisearchService.iter_task_pages down to the last mirrored uid, and
+    mirrored tasks that were still enqueued or processing are re-read by
+    uid. Records stay after the tasks are deleted in Meilisearch. Records
+    are written with INSERT ... ON CONFLICT (ON DUPLICATE KEY on MySQL), so
+    syncs of one project running in different workers don't collide.
+    """
+
+    UNFINISHED_STATUSES = ("enqueued", "processing")
+
+    def __init__(self, page_size: int = 1000):
+        self.page_size = page_size
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _project_lock(self, project_id: int) -> threading.Lock:
+        with self._lock:
+            return self._locks.setdefault(project_id, threading.Lock())
+
+    # ==================== Sync ====================
+
+    def sync(self, project_id: int, service: MeilisearchService, max_pages: int = None,
+             on_progress: Callable[[Dict[str, Any]], None] = None) -> Dict[str, Any]:
+        """Mirror new tasks and refresh unfinished ones
+
+        With max_pages the walk over new tasks stops early and resumes on
+        the next sync.
+        """
+        with self._project_lock(project_id):
+            session = db.session
+            state = session.get(TaskSyncState, project_id)
+            if state is None:
+                try:
+                    session.add(TaskSyncState(project_id=project_id, last_uid=-1))
+                    session.commit()
+                except IntegrityError:
+                    # Created by a sync in another worker
+                    session.rollback()
+                state = session.get(TaskSyncState, project_id)
+
+            stats = {"fetched": 0, "inserted": 0, "updated": 0, "complete": True}
+            for tasks in self._walk(session, state, service, max_pages, stats):
+                inserted, updated = self._upsert(session, project_id, tasks)
+                stats["inserted"] += inserted
+                stats["updated"] += updated
+                session.commit()
+                if on_progress:
+                    on_progress(dict(stats, lastUid=state.last_uid))
+
+            inserted, updated = self._upsert(session, project_id, self._unfinished(session, project_id, service))
+            stats["inserted"] += inserted
+            stats["updated"] += updated
+            if stats["complete"]:
+                state.synced_at = datetime.utcnow()
+            session.commit()
+            stats["lastUid"] = state.last_uid
+            return stats
+
+    def _walk(self, session, state: TaskSyncState, service: MeilisearchService,
+              max_pages: Optional[int], stats: Dict[str, Any]) -> Iterable[List[Dict[str, Any]]]:
+        """Yield pages of tasks newer than state.last_uid, advancing the cursor"""
+        start = state.resume_from if state.walk_top is not None else None
+        pages = service.iter_task_pages(page_size=self.page_size, from_uid=start)
+        new = []
+        try:
+            for count, results in enumerate(pages):
+                if max_pages is not None and count >= max_pages:
+                    stats["complete"] = False
+                    return
+                stats["fetched"] += len(results)
+                if state.walk_top is None:
+                    state.walk_top = results[0]["uid"]
+
+                new = [task for task in results if task["uid"] > state.last_uid]
+                if len(new) < len(results):
+                    break
+                # from is inclusive, so this resumes right after the page
+                state.resume_from = results[-1]["uid"] - 1
+                yield new
+                new = []
+        finally:
+            pages.close()
+        self._finish_walk(state)
+        yield new
+
+    @staticmethod
+    def _finish_walk(state: TaskSyncState):
+        if state.walk_top is not None:
+            state.last_uid = max(state.last_uid, state.walk_top)
+        state.walk_top = None
+        state.resume_from = None
+
+    def _unfinished(self, session, project_id: int, service: MeilisearchService) -> List[Dict[str, Any]]:
+        """Re-read mirrored tasks that had not finished when last synced"""
+        uids = [uid for (uid,) in session.query(TaskRecord.uid).filter(
+            TaskRecord.project_id == project_id,
+            TaskRecord.status.in_(self.UNFINISHED_STATUSES),
+        )]
+        tasks = []
+        for start in range(0, len(uids), self.page_size):
+            chunk = uids[start:start + self.page_size]
+            tasks.extend(service.get_tasks({"uids": chunk, "limit": len(chunk)}).get("results", []))
+        return tasks
+
+    def _upsert(self, session, project_id: int, tasks: List[Dict[str, Any]]) -> Tuple[int, int]:
+        if not tasks:
+            return 0, 0
+        existing = {uid for (uid,) in session.query(TaskRecord.uid).filter(
+            TaskRecord.project_id == project_id,
+            TaskRecord.uid.in_([task["uid"] for task in tasks]),
+        )}
+        now = datetime.utcnow()
+        rows = {}
+        for task in tasks:
+            error = task.get("error")
+            rows[task["uid"]] = {
+                "project_id": project_id,
+                "uid": task["uid"],
+                "index_uid": task.get("indexUid"),
+                "status": task.get("status"),
+                "type": task.get("type"),
+                "canceled_by": task.get("canceledBy"),
+                "error_code": error.get("code") if isinstance(error, dict) else None,
+                "error": json.dumps(error, default=str) if error else None,
+                "details": json.dumps(task["details"], default=str) if task.get("details") else None,
+                "duration": task.get("duration"),
+                "duration_ms": parse_duration_ms(task.get("duration")),
+                "enqueued_at": parse_datetime(task.get("enqueuedAt")),
+                "started_at": parse_datetime(task.get("startedAt")),
+                "finished_at": parse_datetime(task.get("finishedAt")),
+                "synced_at": now,
+            }
+        rows = list(rows.values())
+        # Keeps each statement well below SQLite's bound parameter limit
+        for start in range(0, len(rows), 500):
+            session.execute(self._upsert_statement(session, rows[start:start + 500]))
+        inserted = len([row for row in rows if row["uid"] not in existing])
+        return inserted, len(rows) - inserted
+
+    @staticmethod
+    def _upsert_statement(session, rows: List[Dict[str, Any]]):
+        """INSERT of task records that updates the ones already mirrored"""
+        columns = [column for column in rows[0] if column not in ("project_id", "uid")]
+        if session.get_bind().dialect.name == "mysql":
+            from sqlalchemy.dialects.mysql import insert
+            statement = insert(TaskRecord).values(rows)
+            return statement.on_duplicate_key_update({c: statement.inserted[c] for c in columns})
+        from sqlalchemy.dialects.sqlite import insert
+        statement = insert(TaskRecord).values(rows)
+        return statement.on_conflict_do_update(
+            index_elements=["project_id", "uid"],
+            set_={c: statement.excluded[c] for c in columns},
+        )
+
+    def state(self, project_id: int) -> Optional[TaskSyncState]:
+        """Sync cursor of a project, or None if it was never synced"""
+        return db.session.get(TaskSyncState, project_id)
+
+    # ==================== Queries ====================
+
+    def _filtered(self, session, project_id: int, filters: Dict[str, Any]):
+        query = session.query(TaskRecord).filter(TaskRecord.project_id == project_id)
+        columns = {
+            "uids": TaskRecord.uid,
+            "statuses": TaskRecord.status,
+            "types": TaskRecord.type,
+            "indexUids": TaskRecord.index_uid,
+            "canceledBy": TaskRecord.canceled_by,
+        }
+        for key in LIST_FILTERS:
+            if filters.get(key):
+                query = query.filter(columns[key].in_(filters[key]))
+        for key, (column, op) in DATE_FILTERS.items():
+            if filters.get(key):
+                column = getattr(TaskRecord, column)
+                value = parse_datetime(filters[key])
+                query = query.filter(column < value if op == "<" else column > value)
+        return query
+
+    def query(self, project_id: int, filters: Dict[str, Any] = None, limit: int = 20,
+              from_uid: int = None) -> Dict[str, Any]:
+        """List mirrored tasks newest-first, paginated like GET /tasks"""
+        filters = filters or {}
+        query = self._filtered(db.session, project_id, filters)
+        total = query.count()
+        if from_uid is not None:
+            query = query.filter(TaskRecord.uid <= from_uid)
+        records = query.order_by(TaskRecord.uid.desc()).limit(limit + 1).all()
+        next_uid = records[limit].uid if len(records) > limit else None
+        return {
+            "results": [record.to_dict() for record in records[:limit]],
+            "total": total,
+            "limit": limit,
+            "from": records[0].uid if records else None,
+            "next": next_uid,
+        }
+
+    def stats(self, project_id: int, filters: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Aggregate mirrored tasks by status, type and index"""
+        session = db.session
+        base = self._filtered(session, project_id, filters or {}).subquery()
+        failed = func.sum(case((base.c.status == "failed", 1), else_=0))
+
+        by_status = dict(session.query(base.c.status, func.count()).group_by(base.c.status).all())
+        by_type = [
+            {
+                "type": type_,
+                "count": count,
+                "failed": int(failed_count or 0),
+                "avgDurationMs": round(avg, 3) if avg is not None else None,
+                "maxDurationMs": maximum,
+            }
+            for type_, count, failed_count, avg, maximum in session.query(
+                base.c.type, func.count(), failed, func.avg(base.c.duration_ms), func.max(base.c.duration_ms)
+            ).group_by(base.c.type).order_by(func.count().desc())
+        ]
+        by_index = [
+            {
+                "indexUid": index_uid,
+                "count": count,
+                "failed": int(failed_count or 0),
+                "failureRate": round((failed_count or 0) / count, 4) if count else 0.0,
+                "avgDurationMs": round(avg, 3) if avg is not None else None,
+            }
+            for index_uid, count, failed_count, avg in session.query(
+                base.c.index_uid, func.count(), failed, func.avg(base.c.duration_ms)
+            ).group_by(base.c.index_uid).order_by(func.count().desc())
+        ]
+        state = self.state(project_id)
+        return {
+            "total": sum(by_status.values()),
+            "byStatus": by_status,
+            "byType": by_type,
+            "byIndex": by_index,
+            "sync": state.to_dict() if state else None,
+        }
+
+
+# Global task mirror
+task_mirror = TaskMirror(page_size=config.get("task_mirror", "page_size", default=1000))
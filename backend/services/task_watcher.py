@@ -0,0 +1,325 @@
+"""
+Shared per-project pollers that push task status changes to subscribers
+"""
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from backend.models import db
+from backend.utils.config import config
+from backend.utils.cache import TTLCache
+from backend.services.search_cache import FINISHED_TASK_STATUSES, search_cache
+
+
+logger = logging.getLogger(__name__)
+
+
+NOT_FOUND = "notFound"
+
+
+class TaskSubscription:
+    """Queue of status changes for the tasks one subscriber is watching
+
+    A one-shot subscription (once=True) wants a single fresh state per
+    task, finished or not, and is done after the next poll.
+    """
+
+    def __init__(self, uids: Iterable[int], once: bool = False):
+        self.uids = frozenset(uids)
+        self.once = once
+        self.pending = set(self.uids)
+        self.tasks = {}
+        self.error = None
+        self._events = queue.Queue()
+
+    @property
+    def done(self) -> bool:
+        """Whether every watched task has finished (or no longer exists)"""
+        return not self.pending
+
+    def publish(self, task: Dict[str, Any]):
+        uid = task.get("uid")
+        self.tasks[uid] = task
+        if self.once or task.get("status") in FINISHED_TASK_STATUSES or task.get("status") == NOT_FOUND:
+            self.pending.discard(uid)
+        self._events.put(task)
+
+    def fail(self, error: Exception):
+        self.error = error
+        self.pending.clear()
+        self._events.put(None)
+
+    def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Next status change, or None if nothing changed within timeout seconds"""
+        try:
+            return self._events.get(timeout=max(timeout, 0))
+        except queue.Empty:
+            return None
+
+
+class TaskPoller:
+    """Polls the union of all watched task uids for one project
+
+    A single background thread runs while anything is watched and fetches
+    all watched tasks with get_tasks(uids=...) each tick, one request per
+    batch_size uids, so the number of subscribers does not change the load
+    on Meilisearch and no request outgrows its URL or page limits. Lookups
+    arriving within min_interval of each other share a request. The tick
+    backs off towards max_interval while nothing changes and drops back to
+    min_interval on the next change or new subscription.
+    """
+
+    def __init__(self, project_id: int, min_interval: float = 0.1, max_interval: float = 5.0,
+                 backoff: float = 1.5, finished: TTLCache = None, batch_size: int = 100):
+        self.project_id = project_id
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.batch_size = max(1, batch_size)
+        self.requests = 0
+        self._interval = min_interval
+        self._subscribers = set()
+        self._background = set()
+        self._tasks = {}
+        self._finished = finished or TTLCache(max_size=1000, ttl=300, name="tasks")
+        self._thread = None
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+
+    def finished(self, uid: int) -> Optional[Dict[str, Any]]:
+        """State of a task recently seen finishing (finished tasks don't change)"""
+        return self._finished.get((self.project_id, uid))
+
+    def subscribe(self, uids: Iterable[int], once: bool = False) -> TaskSubscription:
+        """Start watching tasks; known states are delivered immediately"""
+        subscription = TaskSubscription(uids, once)
+        with self._lock:
+            self._subscribers.add(subscription)
+            if not once:
+                for uid in subscription.uids:
+                    known = self.finished(uid) or self._tasks.get(uid)
+                    if known is not None:
+                        subscription.publish(known)
+            if not subscription.done:
+                self._start()
+        return subscription
+
+    def unsubscribe(self, subscription: TaskSubscription):
+        """Stop delivering changes to a subscription"""
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def watch(self, uids: Iterable[int]):
+        """Poll tasks until they finish without a subscriber
+
+        Their completion still reaches the search cache.
+        """
+        with self._lock:
+            new = set(uids) - self._background
+            if new:
+                self._background |= new
+                self._start()
+
+    def _start(self):
+        # Called with the lock held
+        self._interval = self.min_interval
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name=f"task-poller-{self.project_id}", daemon=True
+            )
+            self._thread.start()
+        self._wake.set()
+
+    def _watched(self) -> list:
+        with self._lock:
+            watched = set(self._background)
+            for subscription in self._subscribers:
+                watched |= subscription.pending
+            for uid in list(self._tasks):
+                if uid not in watched:
+                    del self._tasks[uid]
+            if not watched:
+                self._thread = None
+            return sorted(watched)
+
+    def _run(self):
+        from backend.services.project_service import ProjectService
+
+        last_fetch = 0.0
+        try:
+            while True:
+                # Let lookups that arrive together share one request
+                time.sleep(max(0.0, self.min_interval - (time.monotonic() - last_fetch)))
+                self._wake.clear()
+                uids = self._watched()
+                if not uids:
+                    return
+                last_fetch = time.monotonic()
+                changed = False
+                try:
+                    service = ProjectService().get_meilisearch_client(self.project_id)
+                    if service is None:
+                        raise LookupError("Project not found")
+                    for start in range(0, len(uids), self.batch_size):
+                        batch = uids[start:start + self.batch_size]
+                        self.requests += 1
+                        result = service.get_tasks({"uids": batch, "limit": len(batch)})
+                        changed = self._publish(batch, result.get("results", [])) or changed
+                except Exception as e:
+                    logger.warning(f"Task poll for project {self.project_id} failed: {e}")
+                    self._fail(e)
+                with self._lock:
+                    if changed:
+                        self._interval = self.min_interval
+                    else:
+                        self._interval = min(self._interval * self.backoff, self.max_interval)
+                    interval = self._interval
+                self._wake.wait(interval)
+        finally:
+            db.close_session()
+
+    def _publish(self, uids: list, tasks: list) -> bool:
+        search_cache.observe_tasks(self.project_id, tasks)
+        # Tasks missing from the response were deleted
+        seen = {task.get("uid") for task in tasks}
+        missing = [uid for uid in uids if uid not in seen]
+        if missing:
+            search_cache.discard_tasks(self.project_id, missing)
+        tasks = tasks + [{"uid": uid, "status": NOT_FOUND} for uid in missing]
+
+        changed = False
+        with self._lock:
+            for task in tasks:
+                uid = task.get("uid")
+                previous = self._tasks.get(uid)
+                is_new = previous is None or previous.get("status") != task.get("status")
+                if is_new:
+                    changed = True
+                    self._tasks[uid] = task
+                status = task.get("status")
+                if status in FINISHED_TASK_STATUSES or status == NOT_FOUND:
+                    self._background.discard(uid)
+                    if status != NOT_FOUND:
+                        self._finished.set((self.project_id, uid), task)
+                for subscription in self._subscribers:
+                    if uid in subscription.pending and (is_new or subscription.once):
+                        subscription.publish(task)
+        return changed
+
+    def _fail(self, error: Exception):
+        # Lookups want an answer now; streams and waits keep polling
+        with self._lock:
+            for subscription in self._subscribers:
+                if subscription.once and subscription.pending:
+                    subscription.fail(error)
+
+
+class TaskWatcher:
+    """Registry of per-project task pollers"""
+
+    def __init__(self, min_interval: float = 0.1, max_interval: float = 5.0, backoff: float = 1.5,
+                 batch_size: int = 100):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.batch_size = batch_size
+        self._finished = TTLCache(max_size=10000, ttl=300, name="tasks")
+        self._pollers = {}
+        self._lock = threading.Lock()
+
+    def poller(self, project_id: int) -> TaskPoller:
+        """Get the shared poller for a project"""
+        with self._lock:
+            poller = self._pollers.get(project_id)
+            if poller is None:
+                poller = self._pollers[project_id] = TaskPoller(
+                    project_id, self.min_interval, self.max_interval, self.backoff, self._finished,
+                    self.batch_size
+                )
+            return poller
+
+    def subscribe(self, project_id: int, uids: Iterable[int]) -> TaskSubscription:
+        """Watch tasks of a project"""
+        return self.poller(project_id).subscribe(uids)
+
+    def unsubscribe(self, project_id: int, subscription: TaskSubscription):
+        """Stop watching"""
+        self.poller(project_id).unsubscribe(subscription)
+
+    def watch(self, project_id: int, uids: Iterable[int]):
+        """Poll tasks in the background until they finish"""
+        uids = [uid for uid in uids if uid is not None]
+        if uids:
+            self.poller(project_id).watch(uids)
+
+    def get_many(self, project_id: int, uids: Iterable[int], timeout_ms: int = 10000) -> Dict[int, Dict[str, Any]]:
+        """Current state of several tasks, fetched with the poller's next request"""
+        poller = self.poller(project_id)
+        tasks = {}
+        for uid in uids:
+            finished = poller.finished(uid)
+            if finished is not None:
+                tasks[uid] = finished
+        missing = [uid for uid in uids if uid not in tasks]
+        if not missing:
+            return tasks
+
+        subscription = poller.subscribe(missing, once=True)
+        deadline = time.monotonic() + timeout_ms / 1000
+        try:
+            while not subscription.done:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"Task lookup did not complete within {timeout_ms}ms")
+                subscription.get(remaining)
+        finally:
+            poller.unsubscribe(subscription)
+        if subscription.error is not None:
+            raise subscription.error
+        tasks.update(subscription.tasks)
+        return tasks
+
+    def get(self, project_id: int, task_uid: int) -> Dict[str, Any]:
+        """Current state of a task; raises LookupError if it does not exist"""
+        task = self.get_many(project_id, [task_uid])[task_uid]
+        if task.get("status") == NOT_FOUND:
+            raise LookupError(f"Task {task_uid} not found")
+        return task
+
+    def wait(self, project_id: int, task_uid: int, timeout_ms: int = 5000,
+             on_update: Callable[[Optional[Dict[str, Any]]], None] = None,
+             interval: float = None) -> Dict[str, Any]:
+        """Block until a task finishes, without a polling loop of its own
+
+        on_update is called with each status change, and with None every
+        interval seconds while nothing changes. timeout_ms=None waits
+        without a limit (background jobs only).
+        """
+        subscription = self.subscribe(project_id, [task_uid])
+        deadline = time.monotonic() + timeout_ms / 1000 if timeout_ms is not None else None
+        try:
+            while not subscription.done:
+                remaining = deadline - time.monotonic() if deadline else None
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"Task {task_uid} did not finish within {timeout_ms}ms")
+                wait = min(x for x in (remaining, interval, 60.0) if x is not None)
+                task = subscription.get(wait)
+                if on_update:
+                    on_update(task)
+            task = subscription.tasks[task_uid]
+            if task.get("status") == NOT_FOUND:
+                raise LookupError(f"Task {task_uid} not found")
+            return task
+        finally:
+            self.unsubscribe(project_id, subscription)
+
+
+# Global task watcher
+task_watcher = TaskWatcher(
+    min_interval=config.get("tasks", "poll_min_interval", default=0.1),
+    max_interval=config.get("tasks", "poll_max_interval", default=5.0),
+    backoff=config.get("tasks", "poll_backoff", default=1.5),
+    batch_size=config.get("tasks", "poll_batch_size", default=100),
+)
@@ -2,5 +2,9 @@
 Utils package initialization
 """
 from .config import config
+from .cache import TTLCache
+from .query_log import query_log
+from .deadline import DeadlineExceeded, request_deadline
+from .metrics import metrics
 
-__all__ = ["config"]
+__all__ = ["config", "TTLCache", "query_log", "DeadlineExceeded", "request_deadline", "metrics"]
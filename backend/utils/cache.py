@@ -0,0 +1,83 @@
+"""
+In-memory caching utilities
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable
+
+from backend.utils.metrics import metrics
+
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU cache with per-entry TTL and hit/miss counters"""
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60, name: str = "cache"):
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a cached value, or default if missing or expired"""
+        now = time.monotonic()
+        hit = False
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    hit = True
+                else:
+                    del self._entries[key]
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        metrics.cache_lookup(self.name, hit)
+        return value if hit else default
+
+    def set(self, key: Hashable, value: Any, ttl: float = None):
+        """Store a value, evicting the least recently used entries when full"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> bool:
+        """Remove a single entry"""
+        with self._lock:
+            return self._entries.pop(key, _MISSING) is not _MISSING
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get size and hit/miss counters"""
+        with self._lock:
+            size = len(self._entries)
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            "name": self.name,
+            "size": size,
+            "maxSize": self.max_size,
+            "ttl": self.ttl,
+            "hits": hits,
+            "misses": misses,
+            "hitRate": round(hits / total, 4) if total else 0.0,
+        }
+
+    def __len__(self):
+        return len(self._entries)
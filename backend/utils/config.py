@@ -47,6 +47,8 @@ class Config:
             "APP_SECRET_KEY": ("app", "secret_key"),
             "SERVER_HOST": ("server", "host"),
             "SERVER_PORT": ("server", "port"),
+            "SERVER_WORKERS": ("server", "workers"),
+            "SERVER_WORKER_CLASS": ("server", "worker_class"),
             "DB_TYPE": ("database", "type"),
             "DB_PATH": ("database", "path"),
             "DB_HOST": ("database", "host"),
@@ -56,6 +58,7 @@ class Config:
             "DB_NAME": ("database", "database"),
             "LOG_LEVEL": ("logging", "level"),
             "LOG_DIR": ("logging", "output_dir"),
+            "HEALTH_ENABLED": ("health", "enabled"),
         }
         
         for env_key, config_path in env_mappings.items():
@@ -105,6 +108,58 @@ class Config:
     def logging(self):
         return self._config.get("logging", {})
     
+    @property
+    def meilisearch(self):
+        return self._config.get("meilisearch", {})
+    
+    @property
+    def cache(self):
+        return self._config.get("cache", {})
+    
+    @property
+    def ingestion(self):
+        return self._config.get("ingestion", {})
+    
+    @property
+    def export(self):
+        return self._config.get("export", {})
+    
+    @property
+    def federated_search(self):
+        return self._config.get("federated_search", {})
+    
+    @property
+    def jobs(self):
+        return self._config.get("jobs", {})
+    
+    @property
+    def tasks(self):
+        return self._config.get("tasks", {})
+    
+    @property
+    def health(self):
+        return self._config.get("health", {})
+    
+    @property
+    def dashboard(self):
+        return self._config.get("dashboard", {})
+    
+    @property
+    def metrics(self):
+        return self._config.get("metrics", {})
+    
+    @property
+    def timing(self):
+        return self._config.get("timing", {})
+    
+    @property
+    def task_mirror(self):
+        return self._config.get("task_mirror", {})
+    
+    @property
+    def query_log(self):
+        return self._config.get("query_log", {})
+    
     @property
     def cors(self):
         return self._config.get("cors", {})
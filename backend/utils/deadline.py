@@ -0,0 +1,50 @@
+"""
+Per-request deadline shared by all upstream calls made while handling it
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+
+_deadline = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when the current request has no time left for upstream calls"""
+
+
+def set_deadline(seconds: Optional[float]):
+    """Start a deadline seconds from now (None or <= 0 clears it); returns a reset token"""
+    expires_at = time.monotonic() + seconds if seconds and seconds > 0 else None
+    return _deadline.set(expires_at)
+
+
+def reset_deadline(token):
+    _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline, or None without one"""
+    expires_at = _deadline.get()
+    if expires_at is None:
+        return None
+    return expires_at - time.monotonic()
+
+
+def check_deadline() -> Optional[float]:
+    """Like remaining(), but raise DeadlineExceeded once it has passed"""
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded("Request deadline exceeded")
+    return left
+
+
+@contextmanager
+def request_deadline(seconds: Optional[float]):
+    """Run a block under its own deadline (None lifts the current one)"""
+    token = set_deadline(seconds)
+    try:
+        yield
+    finally:
+        reset_deadline(token)
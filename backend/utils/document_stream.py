@@ -0,0 +1,354 @@
+"""
+Incremental parsers for streaming document uploads and helpers for exports
+"""
+import codecs
+import csv
+import json
+import re
+import zlib
+from typing import Any, BinaryIO, Iterable, Iterator, List, Tuple
+
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+_CONTENT = re.compile(rb"\S")
+# A line holding anything but whitespace
+_CONTENT_LINE = re.compile(rb"^[^\S\n]*\S", re.MULTILINE)
+
+
+def iter_text(stream: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """Decode a binary stream as UTF-8 text, one chunk at a time"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    while True:
+        data = stream.read(chunk_size)
+        if not data:
+            break
+        text = decoder.decode(data)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def iter_lines(chunks: Iterable[str]) -> Iterator[str]:
+    """Split text chunks into lines, keeping line endings"""
+    pending = ""
+    for chunk in chunks:
+        pending += chunk
+        start = 0
+        while True:
+            end = pending.find("\n", start)
+            if end < 0:
+                break
+            yield pending[start:end + 1]
+            start = end + 1
+        pending = pending[start:]
+    if pending:
+        yield pending
+
+
+class JsonStreamReader:
+    """Incremental reader for a JSON document that may not fit in memory
+
+    Values are decoded one at a time from a growing text buffer; only the
+    value currently being decoded is held in memory.
+    """
+
+    _WHITESPACE = " \t\n\r"
+    _NUMBER_TAIL = ".eE+-"
+
+    def __init__(self, stream: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self._chunks = iter_text(stream, chunk_size)
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, min_size: int = 1) -> bool:
+        """Append at least min_size characters to the buffer, False at EOF"""
+        parts = []
+        added = 0
+        while added < min_size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._eof = True
+                break
+            parts.append(chunk)
+            added += len(chunk)
+        if parts:
+            self._buf = self._buf[self._pos:] + "".join(parts)
+            self._pos = 0
+        return added > 0
+
+    def _error(self, msg: str):
+        return json.JSONDecodeError(msg, self._buf, self._pos)
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character, or "" at EOF"""
+        while True:
+            buf = self._buf
+            pos = self._pos
+            while pos < len(buf) and buf[pos] in self._WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char: str):
+        if self.peek() != char:
+            raise self._error(f"Expecting '{char}'")
+        self._pos += 1
+
+    def read_value(self) -> Tuple[Any, int]:
+        """Decode the next value, returning it with its size in characters"""
+        if not self.peek():
+            raise self._error("Expecting value")
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+                # Grow geometrically so large values are not re-parsed per chunk
+                self._fill(len(self._buf) - self._pos)
+                continue
+            if not self._eof and (end == len(self._buf) or (
+                    isinstance(value, (int, float)) and self._buf[end] in self._NUMBER_TAIL)):
+                # A value cut at the buffer end (e.g. "12" of "12.5e3") may continue
+                if self._fill():
+                    continue
+            size = end - self._pos
+            self._pos = end
+            return value, size
+
+    def iter_array(self) -> Iterator[Tuple[Any, int]]:
+        """Iterate over the items of the array starting at the cursor"""
+        self._expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.read_value()
+            char = self.peek()
+            self._pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                self._pos -= 1
+                raise self._error("Expecting ',' delimiter")
+
+    def descend(self, path: List[str]) -> bool:
+        """Move the cursor to the value at a field path, False if absent
+
+        Keys name object members and digits index arrays. Values passed over
+        on the way are decoded one at a time and discarded.
+        """
+        for key in path:
+            char = self.peek()
+            if char == "{":
+                self._pos += 1
+                while True:
+                    if self.peek() == "}":
+                        return False
+                    name, _ = self.read_value()
+                    if not isinstance(name, str):
+                        raise self._error("Expecting property name")
+                    self._expect(":")
+                    if name == key:
+                        break
+                    self.read_value()
+                    char = self.peek()
+                    if char == "}":
+                        return False
+                    self._expect(",")
+            elif char == "[" and key.isdigit():
+                self._pos += 1
+                for _ in range(int(key)):
+                    if self.peek() == "]":
+                        return False
+                    self.read_value()
+                    if self.peek() == "]":
+                        return False
+                    self._expect(",")
+                if self.peek() == "]":
+                    return False
+            else:
+                return False
+        return True
+
+    def iter_items(self) -> Iterator[Tuple[Any, int]]:
+        """Iterate over the array at the cursor, or yield the object there"""
+        char = self.peek()
+        if char == "[":
+            yield from self.iter_array()
+        elif char == "{":
+            yield self.read_value()
+        else:
+            raise self._error("Expecting a JSON array or object")
+
+    def iter_documents(self) -> Iterator[Tuple[Any, int]]:
+        """Iterate over documents in a JSON array, or a single JSON object"""
+        yield from self.iter_items()
+        if self.peek():
+            raise self._error("Extra data")
+
+
+def iter_json_documents(stream: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[Any, int]]:
+    """Stream (document, size) pairs from a JSON array or object"""
+    return JsonStreamReader(stream, chunk_size).iter_documents()
+
+
+def iter_csv_documents(stream: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[dict, int]]:
+    """Stream (row, size) pairs from a CSV file with a header row"""
+    lines = iter_lines(iter_text(stream, chunk_size))
+    for row in csv.DictReader(lines):
+        size = sum(len(k or "") + len(v or "") + 6 for k, v in row.items() if isinstance(v, str))
+        yield row, size
+
+
+def _first_record_end(buf: bytes, quote: bytes = None) -> int:
+    """Offset just past the first record-ending newline in buf, or 0"""
+    pos = buf.find(b"\n")
+    while pos >= 0:
+        if quote is None or buf.count(quote, 0, pos) % 2 == 0:
+            return pos + 1
+        pos = buf.find(b"\n", pos + 1)
+    return 0
+
+
+def _last_record_end(buf: bytes, quote: bytes = None) -> int:
+    """Offset just past the last record-ending newline in buf, or 0
+
+    With a quote character, newlines inside quoted fields are skipped; buf
+    must start at a record boundary.
+    """
+    pos = buf.rfind(b"\n")
+    if quote is None or pos < 0:
+        return pos + 1
+    quotes_before = buf.count(quote)
+    end = len(buf)
+    while pos >= 0:
+        quotes_before -= buf.count(quote, pos, end)
+        if quotes_before % 2 == 0:
+            return pos + 1
+        end = pos
+        pos = buf.rfind(b"\n", 0, pos)
+    return 0
+
+
+def _count_records(buf: bytes, quote: bytes = None) -> int:
+    """Number of non-blank records in buf, skipping newlines inside quoted fields
+
+    buf must start at a record boundary; a last record without a trailing
+    newline is counted too.
+    """
+    if quote is None:
+        return sum(1 for _ in _CONTENT_LINE.finditer(buf))
+    count = quotes = start = record_start = 0
+    pos = buf.find(b"\n")
+    while pos >= 0:
+        quotes += buf.count(quote, start, pos)
+        if quotes % 2 == 0:
+            if _CONTENT.search(buf, record_start, pos):
+                count += 1
+            record_start = pos + 1
+        start = pos
+        pos = buf.find(b"\n", pos + 1)
+    if _CONTENT.search(buf, record_start):
+        count += 1
+    return count
+
+
+def iter_line_batches(stream: BinaryIO, max_bytes: int, header: bool = False,
+                      quote: bytes = None) -> Iterator[Tuple[bytes, int]]:
+    """Split a line-oriented byte stream into (payload, record_count) batches
+
+    Batches are cut only at record boundaries and never decoded, so the
+    bytes can be forwarded as-is. With header=True the first record is
+    repeated at the start of every batch, as CSV requires. A single record
+    larger than max_bytes is sent in a batch of its own.
+    """
+    buf = b""
+    eof = False
+
+    def read_more(size):
+        nonlocal buf, eof
+        data = stream.read(max(size, 1))
+        if data:
+            buf += data
+        else:
+            eof = True
+
+    read_more(DEFAULT_CHUNK_SIZE)
+    if buf.startswith(codecs.BOM_UTF8):
+        buf = buf[len(codecs.BOM_UTF8):]
+
+    header_line = b""
+    if header:
+        end = _first_record_end(buf, quote)
+        while not end and not eof:
+            read_more(len(buf))
+            end = _first_record_end(buf, quote)
+        end = end or len(buf)
+        header_line, buf = buf[:end], buf[end:]
+        if not header_line.endswith(b"\n"):
+            header_line += b"\n"
+
+    limit = max(max_bytes - len(header_line), 1)
+    while buf or not eof:
+        while not eof and len(buf) < limit:
+            read_more(limit - len(buf))
+        if eof:
+            end = len(buf)
+        else:
+            end = _last_record_end(buf[:limit], quote) or _first_record_end(buf, quote)
+            if not end:
+                # One record spans the whole buffer; keep reading until it ends
+                read_more(len(buf))
+                continue
+        chunk, buf = buf[:end], buf[end:]
+        if chunk.strip():
+            yield header_line + chunk, _count_records(chunk, quote)
+
+
+def iter_batches(items: Iterable[Tuple[Any, int]], max_docs: int,
+                 max_bytes: int) -> Iterator[List[Any]]:
+    """Group (document, size) pairs into batches bounded by count and size"""
+    batch = []
+    batch_bytes = 0
+    for doc, size in items:
+        if batch and (len(batch) >= max_docs or batch_bytes + size > max_bytes):
+            yield batch
+            batch = []
+            batch_bytes = 0
+        batch.append(doc)
+        batch_bytes += size
+    if batch:
+        yield batch
+
+
+# ==================== Exports ====================
+
+def chain_first(first: List[Any], rest: Iterable[List[Any]]) -> Iterator[List[Any]]:
+    """Yield an already fetched first page (unless empty), then the rest"""
+    if first:
+        yield first
+    yield from rest
+
+
+def iter_gzip(chunks: Iterable[bytes], enabled: bool = True) -> Iterator[bytes]:
+    """Stream byte chunks as one gzip member, or unchanged if not enabled
+
+    Empty chunks (the compressor buffers small input) are not yielded.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if enabled else None
+    for chunk in chunks:
+        if compressor:
+            chunk = compressor.compress(chunk)
+        if chunk:
+            yield chunk
+    if compressor:
+        yield compressor.flush()
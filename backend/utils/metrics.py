@@ -0,0 +1,89 @@
+"""
+Prometheus metrics for API requests, upstream Meilisearch calls and caches
+"""
+import os
+from typing import Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest,
+)
+from prometheus_client import multiprocess
+
+from backend.utils.config import config
+
+
+_REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+class Metrics:
+    """Counters and histograms exposed at /metrics
+
+    Under gunicorn every worker writes its samples to PROMETHEUS_MULTIPROC_DIR
+    (set up by config/gunicorn.conf.py) and a scrape aggregates all of them,
+    whichever worker serves it. Without that variable the process's own
+    registry is exported.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        if not enabled:
+            return
+        self.requests = Counter(
+            "admin_http_requests_total", "API requests handled",
+            ["method", "route", "status"],
+        )
+        self.request_latency = Histogram(
+            "admin_http_request_duration_seconds", "API request latency",
+            ["method", "route"], buckets=_REQUEST_BUCKETS,
+        )
+        self.in_flight = Gauge(
+            "admin_http_requests_in_flight", "API requests being handled",
+            ["method", "route"], multiprocess_mode="livesum",
+        )
+        self.upstream_latency = Histogram(
+            "admin_meilisearch_request_duration_seconds", "MeilisearchService call latency",
+            ["operation", "project"], buckets=_REQUEST_BUCKETS,
+        )
+        self.upstream_errors = Counter(
+            "admin_meilisearch_request_errors_total", "MeilisearchService calls that raised",
+            ["operation", "project", "error"],
+        )
+        self.cache_lookups = Counter(
+            "admin_cache_lookups_total", "In-memory cache lookups",
+            ["cache", "result"],
+        )
+
+    def request_started(self, method: str, route: str):
+        if self.enabled:
+            self.in_flight.labels(method, route).inc()
+
+    def request_finished(self, method: str, route: str, status: int, seconds: float):
+        if self.enabled:
+            self.in_flight.labels(method, route).dec()
+            self.requests.labels(method, route, str(status)).inc()
+            self.request_latency.labels(method, route).observe(seconds)
+
+    def observe_upstream(self, operation: str, project_id: Optional[int], seconds: float,
+                         error: Exception = None):
+        if self.enabled:
+            project = "" if project_id is None else str(project_id)
+            self.upstream_latency.labels(operation, project).observe(seconds)
+            if error is not None:
+                self.upstream_errors.labels(operation, project, type(error).__name__).inc()
+
+    def cache_lookup(self, cache: str, hit: bool):
+        if self.enabled:
+            self.cache_lookups.labels(cache, "hit" if hit else "miss").inc()
+
+    def render(self) -> Tuple[bytes, str]:
+        """Exposition text of all workers' samples and its content type"""
+        if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = REGISTRY
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+# Global metrics
+metrics = Metrics(enabled=config.get("metrics", "enabled", default=True))
@@ -0,0 +1,156 @@
+"""
+Sampled, structured search query log
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .config import config
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread"""
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass  # Drop rather than block the request when the writer falls behind
+
+
+class _QueryRecordFormatter(logging.Formatter):
+    """Render a query record dict as one JSON line of bounded size"""
+
+    def __init__(self, max_bytes: int):
+        super().__init__()
+        self.max_bytes = max_bytes
+
+    def format(self, record):
+        entry = record.msg
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=str)
+        if len(line.encode("utf-8")) <= self.max_bytes:
+            return line
+        # Shrink the free-form fields first; the numbers are what matter
+        entry = dict(entry, truncated=True)
+        budget = max(self.max_bytes // 4, 32)
+        for key in ("q", "params", "error"):
+            if entry.get(key) is not None:
+                value = entry[key] if isinstance(entry[key], str) else json.dumps(
+                    entry[key], ensure_ascii=False, default=str)
+                entry[key] = value[:budget]
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=str)
+        if len(line.encode("utf-8")) > self.max_bytes:
+            for key in ("q", "params", "error"):
+                entry.pop(key, None)
+            line = json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=str)
+        return line
+
+
+class QueryLog:
+    """Writes a sample of search queries as JSON lines through a background thread
+
+    Errors and queries slower than slow_ms are always written; other
+    queries are kept with probability sample_rate. Nothing is formatted
+    unless a query is kept, and formatting happens on the listener thread.
+    """
+
+    def __init__(self, enabled: bool = True, sample_rate: float = 0.01, slow_ms: float = 500,
+                 max_record_bytes: int = 2048):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.max_record_bytes = max_record_bytes
+        self.logger = logging.getLogger("meilisearch_admin.query")
+        self.logger.propagate = False
+        self._listener = None
+        self._pid = None
+        self._lock = threading.Lock()
+        atexit.register(self.stop)
+
+    def _ensure_started(self):
+        # Started lazily per process: gunicorn forks workers after import
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            log_config = config.logging
+            log_dir = Path(log_config.get("output_dir", "./logs"))
+            log_dir.mkdir(parents=True, exist_ok=True)
+            file_handler = RotatingFileHandler(
+                log_dir / config.get("query_log", "file_name", default="queries.log"),
+                maxBytes=log_config.get("max_bytes", 10485760),
+                backupCount=log_config.get("backup_count", 5),
+                encoding="utf-8",
+            )
+            file_handler.setFormatter(_QueryRecordFormatter(self.max_record_bytes))
+            records = queue.Queue(maxsize=10000)
+            for handler in list(self.logger.handlers):
+                self.logger.removeHandler(handler)
+            self.logger.addHandler(_DeferredQueueHandler(records))
+            self.logger.setLevel(logging.INFO)
+            self._listener = QueueListener(records, file_handler)
+            self._listener.start()
+            self._pid = os.getpid()
+
+    def should_log(self, latency_ms: float, error: bool = False) -> bool:
+        """Whether a query with this outcome is kept"""
+        if not self.enabled:
+            return False
+        if error or latency_ms >= self.slow_ms:
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def record(self, project_id: int, uid: str, query: str, params: Dict[str, Any],
+               latency_ms: float, result: Optional[Dict[str, Any]] = None,
+               cached: bool = False, error: str = None):
+        """Log a search query if it is sampled"""
+        if not self.should_log(latency_ms, error is not None):
+            return
+        entry = {
+            "ts": round(time.time(), 3),
+            "projectId": project_id,
+            "indexUid": uid,
+            "q": query,
+            "params": params,
+            "latencyMs": round(latency_ms, 2),
+            "cached": cached,
+        }
+        if latency_ms >= self.slow_ms:
+            entry["slow"] = True
+        if result is not None:
+            entry["hits"] = len(result.get("hits") or ())
+            entry["totalHits"] = result.get("estimatedTotalHits", result.get("totalHits"))
+            entry["processingTimeMs"] = result.get("processingTimeMs")
+        if error is not None:
+            entry["error"] = error
+        self._ensure_started()
+        self.logger.info(entry)
+
+    def stop(self):
+        """Flush and stop the listener thread"""
+        with self._lock:
+            if self._listener is not None and self._pid == os.getpid():
+                self._listener.stop()
+            self._listener = None
+            self._pid = None
+
+
+# Global query log
+query_log = QueryLog(
+    enabled=config.get("query_log", "enabled", default=True),
+    sample_rate=config.get("query_log", "sample_rate", default=0.01),
+    slow_ms=config.get("query_log", "slow_ms", default=500),
+    max_record_bytes=config.get("query_log", "max_record_bytes", default=2048),
+)
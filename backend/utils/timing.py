@@ -0,0 +1,74 @@
+"""
+Per-request time breakdown for Server-Timing headers and the slow-request log
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+
+_timings = ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    """Time spent per category (db, upstream, serialize) within one request"""
+
+    __slots__ = ("started", "durations", "counts")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations = {}
+        self.counts = {}
+
+    def add(self, name: str, seconds: float):
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def to_dict(self) -> Dict[str, float]:
+        """Milliseconds per category plus total"""
+        data = {name: round(seconds * 1000, 2) for name, seconds in self.durations.items()}
+        data["total"] = round(self.elapsed() * 1000, 2)
+        return data
+
+    def header(self) -> str:
+        """Server-Timing header value"""
+        parts = []
+        for name, seconds in self.durations.items():
+            count = self.counts[name]
+            parts.append(f'{name};dur={seconds * 1000:.2f};desc="{count} call{"" if count == 1 else "s"}"')
+        parts.append(f"total;dur={self.elapsed() * 1000:.2f}")
+        return ", ".join(parts)
+
+
+def start_timing():
+    """Start timing the current request; returns a reset token"""
+    return _timings.set(RequestTimings())
+
+
+def end_timing(token):
+    _timings.reset(token)
+
+
+def current() -> Optional[RequestTimings]:
+    """Timings of the current request, or None outside one"""
+    return _timings.get()
+
+
+def record(name: str, seconds: float):
+    """Add time to a category of the current request (no-op outside one)"""
+    timings = _timings.get()
+    if timings is not None:
+        timings.add(name, seconds)
+
+
+@contextmanager
+def timed(name: str):
+    """Record the time spent in a block under name"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - started)
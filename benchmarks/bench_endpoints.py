@@ -0,0 +1,275 @@
+"""
+Throughput and latency of the main API endpoints against a fake Meilisearch
+
+Starts benchmarks/fake_meilisearch.py and the app from backend.app.create_app
+(temporary database and log directory, werkzeug threaded server) in their
+own processes. It then drives each endpoint from client threads over HTTP
+and reports requests/s and p50/p90/p99 latency. Everything binds to
+127.0.0.1, so no network access is needed.
+
+Results are written as JSON (benchmarks/results/ by default). With
+--compare they are checked against an earlier run, and --max-regression
+turns a drop in throughput or a rise in p99 beyond that fraction into a
+non-zero exit status for CI.
+
+Usage: python benchmarks/bench_endpoints.py [--requests 500] [--concurrency 8]
+           [--endpoints search,documents] [--latency-ms 2] [--hits 20]
+           [--label NAME] [--compare results/base.json] [--max-regression 0.2]
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import requests
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import fake_meilisearch  # noqa: E402
+
+
+# name -> (method, path, JSON body)
+ENDPOINTS = {
+    "search": ("POST", "/api/projects/{project}/indexes/{index}/search", {"q": "word", "limit": 20}),
+    "documents": ("GET", "/api/projects/{project}/indexes/{index}/documents?limit=20", None),
+    "indexes": ("GET", "/api/projects/{project}/indexes", None),
+    "settings": ("GET", "/api/projects/{project}/indexes/{index}/settings", None),
+    "tasks": ("GET", "/api/projects/{project}/tasks?limit=20", None),
+}
+
+
+def _serve_fake(options, ready):
+    fake = fake_meilisearch.FakeMeilisearch(**options)
+    ready.put(fake.url)
+    fake._server.serve_forever()
+
+
+def _serve_app(workdir, ready):
+    # Read by backend.utils.config when it is first imported. The health
+    # monitor is off so only the benchmark's requests reach the fake
+    # instance; importing backend.app runs create_app().
+    os.environ.update({
+        "APP_DEBUG": "false",
+        "DB_PATH": str(Path(workdir) / "bench.db"),
+        "LOG_DIR": str(Path(workdir) / "logs"),
+        "HEALTH_ENABLED": "false",
+    })
+    os.environ.pop("PROMETHEUS_MULTIPROC_DIR", None)
+
+    import logging
+    from werkzeug.serving import make_server
+    from backend.app import app
+
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    ready.put(f"http://127.0.0.1:{server.port}")
+    server.serve_forever()
+
+
+def start_process(ctx, target, *args, timeout=60):
+    ready = ctx.Queue()
+    process = ctx.Process(target=target, args=(*args, ready), daemon=True)
+    process.start()
+    return process, ready.get(timeout=timeout)
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def run_endpoint(base_url, method, path, body, total, concurrency, warmup):
+    """Send total requests from concurrency threads; returns the summary"""
+    url = base_url + path
+    with requests.Session() as session:
+        response = session.request(method, url, json=body, timeout=30)
+        if response.status_code != 200:
+            return {"error": f"HTTP {response.status_code}: {response.text[:200]}"}
+        for _ in range(warmup):
+            session.request(method, url, json=body, timeout=30)
+
+    counter = itertools.count()
+    latencies = []
+    errors = []
+
+    def worker():
+        samples = []
+        with requests.Session() as session:
+            while next(counter) < total:
+                started = time.perf_counter()
+                try:
+                    response = session.request(method, url, json=body, timeout=30)
+                    if response.status_code >= 400:
+                        errors.append(response.status_code)
+                except requests.RequestException as e:
+                    errors.append(type(e).__name__)
+                samples.append(time.perf_counter() - started)
+        latencies.extend(samples)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "seconds": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "meanMs": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else None,
+        "p50Ms": round(percentile(latencies, 0.50) * 1000, 2) if latencies else None,
+        "p90Ms": round(percentile(latencies, 0.90) * 1000, 2) if latencies else None,
+        "p99Ms": round(percentile(latencies, 0.99) * 1000, 2) if latencies else None,
+        "maxMs": round(latencies[-1] * 1000, 2) if latencies else None,
+    }
+
+
+def git_revision():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                                    capture_output=True, text=True, check=True).stdout.strip())
+        return {"commit": commit, "dirty": dirty}
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline, max_regression):
+    """Print changes against a baseline run; returns the regressed endpoints"""
+    print(f"\nCompared with {baseline.get('label') or baseline.get('createdAt')} "
+          f"({(baseline.get('git') or {}).get('commit', 'unknown revision')})")
+    print(f"{'endpoint':<12} {'rps':>18} {'p50 ms':>20} {'p99 ms':>20}")
+    regressed = []
+    for name, result in current["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(name)
+        if not before or "error" in before or "error" in result:
+            continue
+
+        def change(key):
+            if not before.get(key):
+                return 0.0
+            return (result[key] - before[key]) / before[key]
+
+        cells = []
+        for key in ("rps", "p50Ms", "p99Ms"):
+            cells.append(f"{before[key]:>7} -> {result[key]:<7} {change(key):+6.1%}")
+        print(f"{name:<12} " + " ".join(cells))
+        if max_regression is not None and (change("rps") < -max_regression or change("p99Ms") > max_regression):
+            regressed.append(name)
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS),
+                        help=f"comma-separated subset of {', '.join(ENDPOINTS)}")
+    parser.add_argument("--requests", type=int, default=500, help="measured requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=8, help="client threads")
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured requests per endpoint")
+    fake_meilisearch.add_arguments(parser)
+    parser.add_argument("--label", help="name stored with the results")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<time>[-label].json)")
+    parser.add_argument("--no-save", action="store_true", help="don't write a results file")
+    parser.add_argument("--compare", help="earlier results file to compare with")
+    parser.add_argument("--max-regression", type=float,
+                        help="with --compare, fail if rps drops or p99 rises by more than this fraction")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.endpoints.split(",") if name.strip()]
+    unknown = [name for name in names if name not in ENDPOINTS]
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(unknown)}")
+
+    ctx = multiprocessing.get_context("spawn")
+    fake_options = {
+        "latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms, "indexes": args.indexes,
+        "documents": args.documents, "hits": args.hits, "doc_bytes": args.doc_bytes, "tasks": args.tasks,
+    }
+    processes = []
+    with tempfile.TemporaryDirectory(prefix="meilisearch-admin-bench-") as workdir:
+        try:
+            fake, fake_url = start_process(ctx, _serve_fake, fake_options)
+            processes.append(fake)
+            app, app_url = start_process(ctx, _serve_app, workdir)
+            processes.append(app)
+
+            response = requests.post(f"{app_url}/api/projects", json={"name": "bench", "url": fake_url},
+                                     timeout=30)
+            response.raise_for_status()
+            project = response.json()["data"]["id"]
+
+            print(f"{args.requests} requests per endpoint, {args.concurrency} client threads, "
+                  f"upstream latency {args.latency_ms}ms, {args.hits} hits of ~{args.doc_bytes} bytes")
+            print(f"{'endpoint':<12} {'rps':>9} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'errors':>7}")
+            results = {}
+            for name in names:
+                method, path, body = ENDPOINTS[name]
+                path = path.format(project=project, index="index_0")
+                result = run_endpoint(app_url, method, path, body, args.requests, args.concurrency,
+                                      args.warmup)
+                results[name] = result
+                if "error" in result:
+                    print(f"{name:<12} failed: {result['error']}")
+                else:
+                    print(f"{name:<12} {result['rps']:>9} {result['p50Ms']:>9} {result['p90Ms']:>9} "
+                          f"{result['p99Ms']:>9} {result['errors']:>7}")
+        finally:
+            for process in processes:
+                process.terminate()
+                process.join(timeout=5)
+
+    run = {
+        "label": args.label,
+        "createdAt": datetime.now().isoformat(timespec="seconds"),
+        "git": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "warmup": args.warmup,
+            **fake_options,
+        },
+        "endpoints": results,
+    }
+
+    if not args.no_save:
+        output = Path(args.output) if args.output else Path(__file__).resolve().parent / "results" / (
+            datetime.now().strftime("%Y%m%d-%H%M%S") + (f"-{args.label}" if args.label else "") + ".json"
+        )
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(run, indent=2) + "\n", encoding="utf-8")
+        print(f"\nResults written to {output}")
+
+    failed = [name for name, result in results.items() if "error" in result]
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        if baseline.get("params") != run["params"]:
+            print("Warning: baseline was run with different parameters")
+        regressed = compare(run, baseline, args.max_regression)
+        if regressed:
+            print(f"Regressed beyond {args.max_regression:.0%}: {', '.join(regressed)}")
+            failed.extend(regressed)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
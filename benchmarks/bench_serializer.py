@@ -0,0 +1,158 @@
+"""
+Per-hit cost of converting search responses before they are returned
+
+Compares the previous recursive _to_dict (copied below as the baseline)
+with the current serializer on a synthetic response carrying large
+_vectors and _formatted fields. The search cases go through the real
+POST .../search handler with Flask's test client, so JSON encoding of the
+response is included; only the SDK index is replaced by one returning the
+canned response.
+
+Usage: python benchmarks/bench_serializer.py [--hits 1000] [--dims 768] [--rounds 20]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Read by backend.utils.config when it is first imported
+_workdir = tempfile.TemporaryDirectory(prefix="meilisearch-admin-bench-")
+os.environ.update({
+    "APP_DEBUG": "false",
+    "DB_PATH": str(Path(_workdir.name) / "bench.db"),
+    "LOG_DIR": str(Path(_workdir.name) / "logs"),
+    "HEALTH_ENABLED": "false",
+})
+
+from backend.services.meilisearch_service import (  # noqa: E402
+    MeilisearchService, _to_dict, _snake_to_camel
+)
+
+
+def _legacy_snake_to_camel(name):
+    components = name.split('_')
+    return components[0] + ''.join(x.title() for x in components[1:])
+
+
+def _legacy_to_dict(obj, convert_keys=True):
+    if obj is None:
+        return None
+    if isinstance(obj, (str, int, float, bool)):
+        return obj
+    if isinstance(obj, dict):
+        if convert_keys:
+            return {_legacy_snake_to_camel(k): _legacy_to_dict(v, convert_keys) for k, v in obj.items()}
+        return {k: _legacy_to_dict(v, convert_keys) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_legacy_to_dict(item, convert_keys) for item in obj]
+    return obj
+
+
+def _legacy_search(result):
+    return {key: _legacy_to_dict(value, convert_keys=False) for key, value in result.items()}
+
+
+class _CannedIndex:
+    def __init__(self, response):
+        self.response = response
+
+    def search(self, query, params):
+        return self.response
+
+
+class _LegacyService(MeilisearchService):
+    """Service whose search converts the response the way it used to"""
+
+    def search(self, uid, query, params=None):
+        return _legacy_search(self._index(uid).search(query, params or {}))
+
+
+def search_handler(service_class, response):
+    """Call POST /api/projects/1/indexes/bench/search with a canned response"""
+    from backend.app import app
+    from backend.api import index_api
+
+    service = service_class("http://127.0.0.1:7700")
+    service._index = lambda uid: _CannedIndex(response)
+    client = app.test_client()
+
+    def run(_):
+        index_api.get_meilisearch_service = lambda project_id: service
+        result = client.post("/api/projects/1/indexes/bench/search", json={"q": "word"})
+        if result.status_code != 200:
+            raise RuntimeError(f"HTTP {result.status_code}: {result.get_data(as_text=True)[:200]}")
+
+    return run
+
+
+def make_response(hits, dims):
+    """Build a search response shaped like Meilisearch's JSON"""
+    rng = random.Random(42)
+    documents = []
+    for i in range(hits):
+        doc = {
+            "id": i,
+            "title": f"Document {i}",
+            "overview": " ".join(f"word{rng.randint(0, 999)}" for _ in range(80)),
+            "genres": ["drama", "comedy"],
+            "release_date": 1600000000 + i,
+        }
+        doc["_formatted"] = {k: str(v) for k, v in doc.items()}
+        doc["_vectors"] = {"default": {
+            "embeddings": [[rng.random() for _ in range(dims)]],
+            "regenerate": False,
+        }}
+        doc["_rankingScore"] = rng.random()
+        documents.append(doc)
+    return {
+        "hits": documents,
+        "query": "word",
+        "processingTimeMs": 3,
+        "limit": hits,
+        "offset": 0,
+        "estimatedTotalHits": hits,
+    }
+
+
+def measure(fn, payload, rounds):
+    fn(payload)
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn(payload)
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--hits", type=int, default=1000)
+    parser.add_argument("--dims", type=int, default=768)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    response = make_response(args.hits, args.dims)
+    cases = [
+        ("search handler (legacy per-value _to_dict)", search_handler(_LegacyService, response)),
+        ("search handler (pass-through)", search_handler(MeilisearchService, response)),
+        ("_to_dict convert_keys (legacy)", lambda r: _legacy_to_dict(r, convert_keys=True)),
+        ("_to_dict convert_keys", lambda r: _to_dict(r, convert_keys=True)),
+        ("json.dumps (reference)", json.dumps),
+    ]
+
+    print(f"{args.hits} hits, {args.dims}-dim vectors, median of {args.rounds} rounds")
+    for name, fn in cases:
+        seconds = measure(fn, response, args.rounds)
+        print(f"{name:<44} {seconds * 1000:9.2f} ms  {seconds * 1e6 / args.hits:9.2f} us/hit")
+    print(f"key cache: {_snake_to_camel.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+Local stand-in for a Meilisearch instance, for benchmarks
+
+Answers the read endpoints the admin backend proxies (health, version,
+stats, indexes, documents, search, settings, tasks) with canned JSON of
+configurable size after a configurable delay, and accepts writes with an
+enqueued task. Responses are rendered once at startup so the server adds
+as little of its own time as possible.
+
+Usage: python benchmarks/fake_meilisearch.py [--port 7700] [--latency-ms 2] [--hits 20]
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+TIMESTAMP = "2024-01-01T00:00:00.000000Z"
+
+
+def make_document(i: int, doc_bytes: int, rng: random.Random) -> dict:
+    words = max(doc_bytes // 8, 1)
+    return {
+        "id": i,
+        "title": f"Document {i}",
+        "overview": " ".join(f"word{rng.randint(0, 999)}" for _ in range(words)),
+        "genres": ["drama", "comedy"],
+        "release_date": 1600000000 + i,
+    }
+
+
+def make_task(uid: int, index_uid: str) -> dict:
+    return {
+        "uid": uid,
+        "batchUid": uid,
+        "indexUid": index_uid,
+        "status": "succeeded",
+        "type": "documentAdditionOrUpdate",
+        "canceledBy": None,
+        "details": {"receivedDocuments": 1000, "indexedDocuments": 1000},
+        "error": None,
+        "duration": "PT0.012345S",
+        "enqueuedAt": TIMESTAMP,
+        "startedAt": TIMESTAMP,
+        "finishedAt": TIMESTAMP,
+    }
+
+
+class FakeMeilisearch:
+    """Threaded HTTP server with canned Meilisearch responses
+
+    latency_ms (plus up to jitter_ms) is slept before every response. hits
+    is the number of search hits, documents the number of documents per
+    index, doc_bytes the rough size of each document.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 2,
+                 jitter_ms: float = 0, indexes: int = 5, documents: int = 1000, hits: int = 20,
+                 doc_bytes: int = 1024, tasks: int = 1000, seed: int = 42):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self._render(indexes, documents, hits, doc_bytes, tasks, random.Random(seed))
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _render(self, indexes, documents, hits, doc_bytes, tasks, rng):
+        uids = [f"index_{i}" for i in range(indexes)]
+        self.index_uids = uids
+        docs = [make_document(i, doc_bytes, rng) for i in range(min(documents, 1000))]
+        index_objects = [
+            {"uid": uid, "primaryKey": "id", "createdAt": TIMESTAMP, "updatedAt": TIMESTAMP}
+            for uid in uids
+        ]
+        index_stats = {
+            "numberOfDocuments": documents,
+            "isIndexing": False,
+            "fieldDistribution": {key: documents for key in docs[0]} if docs else {},
+        }
+        settings = {
+            "displayedAttributes": ["*"],
+            "searchableAttributes": ["title", "overview"],
+            "filterableAttributes": ["genres", "release_date"],
+            "sortableAttributes": ["release_date"],
+            "rankingRules": ["words", "typo", "proximity", "attribute", "sort", "exactness"],
+            "stopWords": [],
+            "nonSeparatorTokens": [],
+            "separatorTokens": [],
+            "dictionary": [],
+            "synonyms": {"movie": ["film"]},
+            "distinctAttribute": None,
+            "proximityPrecision": "byWord",
+            "typoTolerance": {
+                "enabled": True,
+                "minWordSizeForTypos": {"oneTypo": 5, "twoTypos": 9},
+                "disableOnWords": [],
+                "disableOnAttributes": [],
+            },
+            "faceting": {"maxValuesPerFacet": 100, "sortFacetValuesBy": {"*": "alpha"}},
+            "pagination": {"maxTotalHits": 1000},
+            "searchCutoffMs": None,
+            "localizedAttributes": None,
+        }
+        task_list = [make_task(uid, uids[uid % len(uids)] if uids else None)
+                     for uid in range(tasks - 1, -1, -1)]
+
+        self.docs = docs
+        self.documents_total = documents
+        self.tasks = task_list
+        self.static = {
+            "/health": {"status": "available"},
+            "/version": {"pkgVersion": "1.12.0", "commitSha": "fake", "commitDate": TIMESTAMP},
+            "/stats": {
+                "databaseSize": documents * doc_bytes * len(uids),
+                "lastUpdate": TIMESTAMP,
+                "indexes": {uid: index_stats for uid in uids},
+            },
+            "/indexes": {"results": index_objects, "offset": 0, "limit": 20, "total": len(uids)},
+        }
+        for index in index_objects:
+            base = f"/indexes/{index['uid']}"
+            self.static[base] = index
+            self.static[f"{base}/stats"] = index_stats
+            self.static[f"{base}/settings"] = settings
+            for name, value in settings.items():
+                # searchableAttributes -> /settings/searchable-attributes
+                route = re.sub(r"([A-Z])", r"-\1", name).lower()
+                self.static[f"{base}/settings/{route}"] = value
+        self.search = json.dumps({
+            "hits": docs[:hits],
+            "query": "word",
+            "processingTimeMs": 1,
+            "limit": hits,
+            "offset": 0,
+            "estimatedTotalHits": documents,
+        }).encode()
+        self.static = {path: json.dumps(body).encode() for path, body in self.static.items()}
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately; avoid the delayed-ACK stall
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status, body: bytes):
+                delay = fake.latency_ms + (random.uniform(0, fake.jitter_ms) if fake.jitter_ms else 0)
+                if delay > 0:
+                    time.sleep(delay / 1000)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _read_body(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                return self.rfile.read(length) if length else b""
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+                body = fake.static.get(parts.path)
+                if body is not None:
+                    return self._send(200, body)
+                if parts.path.endswith("/documents") and parts.path.startswith("/indexes/"):
+                    return self._send(200, fake.documents_page(query))
+                if parts.path == "/tasks":
+                    return self._send(200, fake.tasks_page(query))
+                match = re.fullmatch(r"/tasks/(\d+)", parts.path)
+                if match and int(match.group(1)) < len(fake.tasks):
+                    return self._send(200, json.dumps(fake.tasks[-1 - int(match.group(1))]).encode())
+                self._not_found()
+
+            def do_POST(self):
+                path = urlsplit(self.path).path
+                payload = self._read_body()
+                if path.endswith("/search") and path.startswith("/indexes/"):
+                    return self._send(200, fake.search)
+                if path.endswith("/documents/fetch"):
+                    return self._send(200, fake.documents_page(json.loads(payload or b"{}")))
+                self._enqueued(path)
+
+            def do_PUT(self):
+                self._read_body()
+                self._enqueued(urlsplit(self.path).path)
+
+            do_PATCH = do_PUT
+
+            def do_DELETE(self):
+                self._read_body()
+                self._enqueued(urlsplit(self.path).path)
+
+            def _enqueued(self, path):
+                match = re.match(r"/indexes/([^/]+)", path)
+                self._send(202, json.dumps({
+                    "taskUid": len(fake.tasks),
+                    "indexUid": match.group(1) if match else None,
+                    "status": "enqueued",
+                    "type": "documentAdditionOrUpdate",
+                    "enqueuedAt": TIMESTAMP,
+                }).encode())
+
+            def _not_found(self):
+                self._send(404, json.dumps({
+                    "message": f"{self.path} not found",
+                    "code": "not_found",
+                    "type": "invalid_request",
+                    "link": "",
+                }).encode())
+
+        return Handler
+
+    def documents_page(self, query: dict) -> bytes:
+        offset = int(query.get("offset", 0))
+        limit = int(query.get("limit", 20))
+        end = min(offset + limit, self.documents_total) if self.docs else offset
+        results = [self.docs[i % len(self.docs)] for i in range(offset, end)]
+        return json.dumps({"results": results, "offset": offset, "limit": limit,
+                           "total": self.documents_total}).encode()
+
+    def tasks_page(self, query: dict) -> bytes:
+        limit = int(query.get("limit", 20))
+        start = int(query["from"]) if "from" in query else len(self.tasks) - 1
+        first = len(self.tasks) - 1 - start
+        page = self.tasks[max(first, 0):max(first, 0) + limit]
+        next_uid = page[-1]["uid"] - 1 if page and page[-1]["uid"] > 0 else None
+        return json.dumps({"results": page, "total": len(self.tasks), "limit": limit,
+                           "from": page[0]["uid"] if page else None, "next": next_uid}).encode()
+
+    def start(self) -> "FakeMeilisearch":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-meilisearch",
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """Payload and latency options shared with bench_endpoints.py"""
+    parser.add_argument("--latency-ms", type=float, default=2, help="delay before every response")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="extra random delay, up to this")
+    parser.add_argument("--indexes", type=int, default=5)
+    parser.add_argument("--documents", type=int, default=1000, help="documents per index")
+    parser.add_argument("--hits", type=int, default=20, help="hits per search response")
+    parser.add_argument("--doc-bytes", type=int, default=1024, help="approximate size of a document")
+    parser.add_argument("--tasks", type=int, default=1000)
+
+
+def from_args(args, host: str = "127.0.0.1", port: int = 0) -> FakeMeilisearch:
+    return FakeMeilisearch(host, port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                           indexes=args.indexes, documents=args.documents, hits=args.hits,
+                           doc_bytes=args.doc_bytes, tasks=args.tasks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7700)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    fake = from_args(args, args.host, args.port)
+    print(f"Fake Meilisearch listening on {fake.url}")
+    try:
+        fake._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Gunicorn configuration, read from the server section of config.yaml
+
+    gunicorn -c config/gunicorn.conf.py backend.app:app
+
+With the default gevent worker class each worker process serves requests
+on greenlets, so slow upstream Meilisearch calls (task waits, stats,
+large searches) only park their own greenlet instead of a whole worker.
+Set server.worker_class to "sync" to get the previous behaviour back.
+
+Workers write Prometheus samples to metrics.multiproc_dir so that /metrics
+reports all of them together.
+"""
+import os
+import shutil
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.utils.config import config  # noqa: E402
+
+
+_server = config.server
+
+bind = f"{_server.get('host', '0.0.0.0')}:{_server.get('port', 5000)}"
+workers = _server.get("workers", 4)
+worker_class = _server.get("worker_class", "gevent")
+# Concurrent requests per gevent worker
+worker_connections = _server.get("worker_connections", 1000)
+timeout = _server.get("timeout", 120)
+graceful_timeout = _server.get("graceful_timeout", 30)
+keepalive = _server.get("keepalive", 5)
+
+accesslog = "-"
+errorlog = "-"
+loglevel = config.logging.get("level", "INFO").lower()
+
+
+# Prometheus multiprocess mode; must be set before workers import the app
+_metrics = config.metrics
+if _metrics.get("enabled", True):
+    os.environ.setdefault(
+        "PROMETHEUS_MULTIPROC_DIR", _metrics.get("multiproc_dir", "/tmp/meilisearch-admin-metrics")
+    )
+
+
+def on_starting(server):
+    # Samples left by a previous run would be summed into the new one
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
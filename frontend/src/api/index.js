@@ -31,6 +31,11 @@ export const projectApi = {
     return api.post('/projects/test-connection', { url, api_key: apiKey })
   },
 
+  // Get health, version and stats of all projects in one request
+  getDashboard(params = {}) {
+    return api.get('/projects/dashboard', { params })
+  },
+
   // Get project stats
   getStats(id) {
     return api.get(`/projects/${id}/stats`)
@@ -255,6 +260,11 @@ export const taskApi = {
   wait(projectId, taskUid, timeout = 5000) {
     return api.post(`/projects/${projectId}/tasks/${taskUid}/wait`, { timeout })
   },
+
+  // Stream task status changes as server-sent events ("task", then "done")
+  stream(projectId, taskUids) {
+    return new EventSource(`/api/projects/${projectId}/tasks/stream?uids=${taskUids.join(',')}`)
+  },
 }
 
 export const keyApi = {
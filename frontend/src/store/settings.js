@@ -46,7 +46,7 @@ const translations = {
     uploadFile: 'Upload File',
     fetchFromUrl: 'Fetch from URL',
     selectImportMethod: 'Select Import Method',
-    uploadJsonCsv: 'Upload JSON or CSV File',
+    uploadJsonCsv: 'Upload JSON, NDJSON or CSV File',
     fetchDocumentsFromRemoteUrl: 'Fetch documents from a remote URL',
     file: 'File',
     chooseFile: 'Choose File',
@@ -336,7 +336,7 @@ const translations = {
     uploadFile: '上传文件',
     fetchFromUrl: '从URL获取',
     selectImportMethod: '选择导入方式',
-    uploadJsonCsv: '上传 JSON 或 CSV 文件',
+    uploadJsonCsv: '上传 JSON、NDJSON 或 CSV 文件',
     fetchDocumentsFromRemoteUrl: '从远程 URL 获取文档',
     file: '文件',
     chooseFile: '选择文件',